@@ -0,0 +1,36 @@
+"""Add trigram indexes for internal link search.
+
+Revision ID: 012
+Revises: 011
+"""
+
+from alembic import op
+
+revision = "012"
+down_revision = "011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The links endpoint searches with ILIKE '%q%', which a btree can't serve
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_internal_links_url_trgm",
+        "internal_links",
+        ["url"],
+        postgresql_using="gin",
+        postgresql_ops={"url": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_internal_links_title_trgm",
+        "internal_links",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_internal_links_title_trgm", table_name="internal_links")
+    op.drop_index("ix_internal_links_url_trgm", table_name="internal_links")
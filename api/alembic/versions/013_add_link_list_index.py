@@ -0,0 +1,30 @@
+"""Index internal links by profile and newest first.
+
+Revision ID: 013
+Revises: 012
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "013"
+down_revision = "012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The links list pages a profile's links by created_at DESC; the
+    # composite index serves that order and every profile_id-only lookup,
+    # so the single-column index is redundant
+    op.create_index(
+        "ix_internal_links_profile_created",
+        "internal_links",
+        ["profile_id", sa.text("created_at DESC")],
+    )
+    op.drop_index("idx_internal_links_profile", table_name="internal_links")
+
+
+def downgrade() -> None:
+    op.create_index("idx_internal_links_profile", "internal_links", ["profile_id"])
+    op.drop_index("ix_internal_links_profile_created", table_name="internal_links")
@@ -60,8 +60,16 @@ async def global_events(request: Request):
 
 
 # Helper for worker to publish events
-async def publish_event(redis, post_id: str, event: str, data: dict):
-    """Publish an event to both post-specific and global channels."""
+async def publish_event(redis, post_id: str, event: str, data: dict, pipe=None):
+    """Publish an event to both post-specific and global channels.
+
+    With `pipe` (a redis pipeline), the PUBLISHes are only queued on it and go
+    out in one round trip, with anything else queued, on `pipe.execute()`.
+    """
     payload = json.dumps({"event": event, "post_id": post_id, **data})
+    if pipe is not None:
+        pipe.publish(f"{CHANNEL_POST_PREFIX}{post_id}", payload)
+        pipe.publish(CHANNEL_GLOBAL, payload)
+        return
     await redis.publish(f"{CHANNEL_POST_PREFIX}{post_id}", payload)
     await redis.publish(CHANNEL_GLOBAL, payload)
@@ -23,10 +23,37 @@ class Settings(BaseSettings):
 
     # Worker
     worker_max_jobs: int = 3
+    # How often an idle worker polls the ARQ queue: lower = faster pickup of
+    # newly enqueued stages, at one extra Redis round trip per poll
+    worker_poll_delay_s: float = 0.5
 
     # Rules directory (override with RULES_DIR env var in Docker)
     rules_dir: str = str(Path(__file__).resolve().parent.parent.parent / "rules")
 
+    # Connection pool for outbound httpx clients (Perplexity, sitemap crawls)
+    http_max_connections: int = 200
+    http_max_keepalive: int = 50
+
+    # Mark each stage's rules as a cacheable prompt prefix (Anthropic prompt
+    # caching: cache reads bill at 10% of input price, writes at 125%)
+    claude_prompt_cache: bool = True
+
+    # Claude Message Batches API for auto-gated stages (50% cheaper, but a
+    # batch can take minutes to hours — only for background throughput)
+    claude_batch_enabled: bool = False
+    claude_batch_window_s: float = 2.0
+    claude_batch_max_size: int = 16
+    claude_batch_poll_s: float = 30.0
+
+    # Exact-match cache for Perplexity/Claude chat responses. Off by default:
+    # re-running a stage on unchanged input is usually a request for a new take
+    llm_cache_enabled: bool = False
+    llm_cache_ttl_s: int = 3600
+    llm_cache_max_entries: int = 256
+
+    # Max concurrent Gemini image generation calls per images stage
+    gemini_concurrency: int = 3
+
     # Media directory for generated images
     media_dir: str = str(Path(__file__).resolve().parent.parent.parent / "media")
 
@@ -4,7 +4,16 @@ import uuid
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, UniqueConstraint, func
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,13 +27,32 @@ class InternalLink(UUIDMixin, Base):
     __tablename__ = "internal_links"
     __table_args__ = (
         UniqueConstraint("profile_id", "url", name="uq_internal_links_profile_url"),
+        # Serves the links list (a profile's links, newest first) and any
+        # lookup by profile_id alone
+        Index(
+            "ix_internal_links_profile_created",
+            "profile_id",
+            text("created_at DESC"),
+        ),
+        # Trigram indexes serve the links endpoint's ILIKE '%q%' search
+        Index(
+            "ix_internal_links_url_trgm",
+            "url",
+            postgresql_using="gin",
+            postgresql_ops={"url": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_internal_links_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
     )
 
     profile_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("website_profiles.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     url: Mapped[str] = mapped_column(Text, nullable=False)
     title: Mapped[str | None] = mapped_column(Text)
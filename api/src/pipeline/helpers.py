@@ -6,9 +6,10 @@ import json
 import logging
 import re
 import time
+from contextvars import ContextVar, Token
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 from uuid import UUID
 
 from sqlalchemy import text, update
@@ -16,34 +17,228 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
 from src.models.post import Post
-from src.pipeline.state import STAGE_CONTENT_MAP, PipelineState
+from src.pipeline.state import (
+    STAGE_CONTENT_MAP,
+    STAGE_OUTPUT_KEY,
+    STATUS_COMPLETE,
+    PipelineState,
+)
+from src.services.llm import (
+    ClaudeBatcher,
+    ClaudeClient,
+    LLMResponse,
+    PerplexityClient,
+    shutdown_gemini_executor,
+)
 
 logger = logging.getLogger(__name__)
 
+
 # ---------------------------------------------------------------------------
-# Module-level event context for publishing SSE logs from stage nodes
+# Per-job event context for publishing SSE logs from stage nodes
 # ---------------------------------------------------------------------------
-_event_redis: Any | None = None
-_event_post_id: str | None = None
-_event_session_factory: Any | None = None
+class EventCtx(NamedTuple):
+    """Where publish_stage_log() sends events for the running post."""
+
+    redis: Any
+    post_id: str
+    session_factory: Any | None
+    # execution_logs entries awaiting flush_stage_logs()
+    pending: list[dict]
+
+
+# A ContextVar, not a global: the worker runs several jobs at once, and each
+# job's task (plus any tasks it spawns, which copy the context) sees only its
+# own post and log buffer
+_EVENT_CTX: ContextVar[EventCtx | None] = ContextVar("event_ctx", default=None)
 
 
 def set_event_context(
     redis: Any, post_id: str, session_factory: Any | None = None
-) -> None:
-    """Set the module-level Redis + post_id so stage nodes can publish logs."""
-    global _event_redis, _event_post_id, _event_session_factory  # noqa: PLW0603
-    _event_redis = redis
-    _event_post_id = post_id
-    _event_session_factory = session_factory
+) -> Token[EventCtx | None]:
+    """Set the current job's Redis + post_id so stage nodes can publish logs.
+
+    Returns a token to pass to clear_event_context().
+    """
+    return _EVENT_CTX.set(EventCtx(redis, post_id, session_factory, []))
+
+
+def clear_event_context(token: Token[EventCtx | None] | None = None) -> None:
+    """Clear the current job's event context after pipeline execution.
+
+    With the token from set_event_context() the previous value is restored;
+    without one the context is simply emptied.
+    """
+    if token is not None:
+        _EVENT_CTX.reset(token)
+    else:
+        _EVENT_CTX.set(None)
+
+
+# ---------------------------------------------------------------------------
+# Shared LLM clients — reused across stages and runs so the HTTP connection
+# pools (and their TLS sessions) stay warm for the life of the worker
+# ---------------------------------------------------------------------------
+_claude_clients: dict[str, ClaudeClient] = {}
+_claude_batchers: dict[str, ClaudeBatcher] = {}
+_perplexity_clients: dict[str, PerplexityClient] = {}
+
+
+def get_claude_client(api_key: str | None) -> ClaudeClient:
+    """Return the shared ClaudeClient for an API key, creating it on first use.
+
+    Stage nodes must not close the returned client — the worker closes all
+    shared clients on shutdown via close_llm_clients().
+    """
+    client = _claude_clients.get(api_key or "")
+    if client is None:
+        client = ClaudeClient(api_key=api_key)
+        _claude_clients[client.api_key] = client
+    return client
+
+
+def get_perplexity_client(api_key: str | None) -> PerplexityClient:
+    """Return the shared PerplexityClient for an API key (see get_claude_client)."""
+    client = _perplexity_clients.get(api_key or "")
+    if client is None:
+        client = PerplexityClient(api_key=api_key)
+        _perplexity_clients[client.api_key] = client
+    return client
+
+
+async def close_llm_clients() -> None:
+    """Close every shared LLM client and the Gemini pool (on worker shutdown)."""
+    clients: list[ClaudeClient | PerplexityClient] = [
+        *_claude_clients.values(),
+        *_perplexity_clients.values(),
+    ]
+    _claude_clients.clear()
+    _claude_batchers.clear()
+    _perplexity_clients.clear()
+    for client in clients:
+        await client.close()
+    shutdown_gemini_executor()
 
 
-def clear_event_context() -> None:
-    """Clear the module-level event context after pipeline execution."""
-    global _event_redis, _event_post_id, _event_session_factory  # noqa: PLW0603
-    _event_redis = None
-    _event_post_id = None
-    _event_session_factory = None
+def use_claude_batch(stage: str, state: PipelineState) -> bool:
+    """Whether a stage's Claude call goes through the Message Batches API."""
+    gate = state.get("stage_settings", {}).get(stage, "auto")
+    return settings.claude_batch_enabled and gate == "auto"
+
+
+async def claude_chat(
+    stage: str,
+    client: ClaudeClient,
+    state: PipelineState,
+    prompt: str,
+    system: str,
+    max_tokens: int,
+    cache_prefix: str = "",
+) -> LLMResponse:
+    """Call Claude for a stage, through the Message Batches API when allowed.
+
+    Batching is used only when enabled in settings and the stage runs
+    without a review gate; otherwise this is a plain real-time chat call.
+    `cache_prefix` is the stage's rules, marked for prompt caching.
+    """
+    if not use_claude_batch(stage, state):
+        return await client.chat(
+            prompt=prompt,
+            system=system,
+            max_tokens=max_tokens,
+            cache_prefix=cache_prefix,
+        )
+
+    batcher = _claude_batchers.get(client.api_key)
+    if batcher is None or batcher.client is not client:
+        batcher = ClaudeBatcher(
+            client,
+            window_s=settings.claude_batch_window_s,
+            max_size=settings.claude_batch_max_size,
+            poll_interval_s=settings.claude_batch_poll_s,
+        )
+        _claude_batchers[client.api_key] = batcher
+    return await batcher.submit(
+        ClaudeClient.message_params(
+            prompt, system=system, max_tokens=max_tokens, cache_prefix=cache_prefix
+        )
+    )
+
+
+async def run_claude_stage(
+    stage: str,
+    state: PipelineState,
+    client: ClaudeClient,
+    *,
+    system: str,
+    max_tokens: int,
+    call_message: str,
+) -> dict:
+    """Run a single-call Claude stage: rules + prompt in, stage output out.
+
+    Shared by stages whose only work is one Claude call on the built
+    prompt; the result is keyed by STAGE_OUTPUT_KEY[stage].
+    """
+    rules = load_rules(stage)
+    await publish_stage_log("Rules loaded, building prompt...", stage=stage)
+    prompt = build_stage_prompt(stage, rules, state)
+
+    await publish_stage_log(call_message, stage=stage)
+    with StageTimer() as timer:
+        response = await claude_chat(
+            stage,
+            client,
+            state,
+            prompt=prompt,
+            system=system,
+            max_tokens=max_tokens,
+            cache_prefix=rules,
+        )
+
+    await publish_stage_log(
+        f"Received {response.tokens_out} tokens in {timer.duration:.1f}s",
+        stage=stage,
+    )
+
+    meta = stage_meta(
+        stage, response.model, response.tokens_in, response.tokens_out, timer.duration
+    )
+    return stage_result(stage, state, response.content, meta)
+
+
+def stage_meta(
+    stage: str, model: str, tokens_in: int, tokens_out: int, duration_s: float
+) -> dict:
+    """Build the per-call metrics dict the worker logs via log_stage_execution."""
+    return {
+        "stage": stage,
+        "model": model,
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        "duration_s": duration_s,
+    }
+
+
+def stage_result(
+    stage: str,
+    state: PipelineState,
+    output: Any,
+    meta: dict,
+    status: str = STATUS_COMPLETE,
+) -> dict:
+    """Build a stage node's return dict.
+
+    The output goes under STAGE_OUTPUT_KEY[stage], alongside the updated
+    stage_status and the stage's metrics.
+    """
+    stage_status = dict(state.get("stage_status", {}))
+    stage_status[stage] = status
+    return {
+        STAGE_OUTPUT_KEY[stage]: output,
+        "current_stage": stage,
+        "stage_status": stage_status,
+        "_stage_meta": meta,
+    }
 
 
 async def publish_stage_log(
@@ -53,19 +248,23 @@ async def publish_stage_log(
     event: str = "log",
     data: dict | None = None,
 ) -> None:
-    """Publish a log event via SSE and persist to execution_logs.
+    """Publish a log event via SSE and queue it for execution_logs.
+
+    The SSE event goes out immediately; the DB entry is buffered until
+    flush_stage_logs() so a stage costs one execution_logs write.
 
     Safe to call even when no context is set (e.g. during tests) — it will
     silently no-op.
     """
-    if _event_redis is None or _event_post_id is None:
+    ctx = _EVENT_CTX.get()
+    if ctx is None:
         return
 
     from src.api.events import publish_event
 
     await publish_event(
-        _event_redis,
-        _event_post_id,
+        ctx.redis,
+        ctx.post_id,
         event,
         {
             "stage": stage,
@@ -76,21 +275,44 @@ async def publish_stage_log(
         },
     )
 
-    # Persist to DB if session factory is available
-    if _event_session_factory is not None:
-        try:
-            async with _event_session_factory() as session:
-                await append_execution_log(
-                    session,
-                    _event_post_id,
-                    stage,
-                    level,
-                    event,
-                    message,
-                    data,
-                )
-        except Exception:
-            logger.debug("Failed to persist execution log entry", exc_info=True)
+    # Persisted in one write by flush_stage_logs() when the stage finishes
+    if ctx.session_factory is not None:
+        ctx.pending.append(_log_entry(stage, level, event, message, data))
+
+
+async def flush_stage_logs() -> None:
+    """Persist the stage's buffered log entries to execution_logs in one write.
+
+    The worker calls this after each stage node returns (or raises). No-op
+    without a context, a session factory, or anything buffered.
+    """
+    ctx = _EVENT_CTX.get()
+    if ctx is None or ctx.session_factory is None or not ctx.pending:
+        return
+
+    entries = list(ctx.pending)
+    ctx.pending.clear()
+    try:
+        async with ctx.session_factory() as session:
+            await append_execution_logs(session, ctx.post_id, entries)
+    except Exception:
+        logger.debug("Failed to persist execution log entries", exc_info=True)
+
+
+def _log_entry(
+    stage: str, level: str, event: str, message: str, data: dict | None
+) -> dict:
+    """Build one execution_logs entry."""
+    entry = {
+        "ts": datetime.now(UTC).isoformat(),
+        "stage": stage,
+        "level": level,
+        "event": event,
+        "message": message,
+    }
+    if data:
+        entry["data"] = data
+    return entry
 
 
 async def append_execution_log(
@@ -101,30 +323,40 @@ async def append_execution_log(
     event: str,
     message: str,
     data: dict | None = None,
+    *,
+    commit: bool = True,
 ) -> None:
     """Append a log entry to the post's execution_logs array (atomic, DB only).
 
     This is the low-level DB writer. For combined SSE + DB logging from stage
-    nodes, use publish_stage_log() which calls this automatically when a
-    session factory is in context.
+    nodes, use publish_stage_log(), which buffers entries for
+    flush_stage_logs() when a session factory is in context. Pass
+    commit=False to leave the write in the caller's transaction.
     """
-    entry = {
-        "ts": datetime.now(UTC).isoformat(),
-        "stage": stage,
-        "level": level,
-        "event": event,
-        "message": message,
-    }
-    if data:
-        entry["data"] = data
+    await append_execution_logs(
+        session,
+        post_id,
+        [_log_entry(stage, level, event, message, data)],
+        commit=commit,
+    )
 
+
+async def append_execution_logs(
+    session: AsyncSession,
+    post_id: str | UUID,
+    entries: list[dict],
+    *,
+    commit: bool = True,
+) -> None:
+    """Append several prebuilt entries to execution_logs in one UPDATE."""
     # Atomic jsonb append — no read-modify-write race
     stmt = text(
         "UPDATE posts SET execution_logs = execution_logs || CAST(:entry AS jsonb) "
         "WHERE id = :post_id"
     )
-    await session.execute(stmt, {"entry": json.dumps([entry]), "post_id": str(post_id)})
-    await session.commit()
+    await session.execute(stmt, {"entry": json.dumps(entries), "post_id": str(post_id)})
+    if commit:
+        await session.commit()
 
 
 # Approximate cost per 1M tokens (USD) — update as pricing changes
@@ -135,16 +367,55 @@ MODEL_COSTS: dict[str, dict[str, float]] = {
 }
 
 
+def compute_cost(model: str, tokens_in: int, tokens_out: int) -> float:
+    """USD cost of a call at MODEL_COSTS rates (0.0 for unknown models)."""
+    cost_info = MODEL_COSTS.get(model, {"input": 0.0, "output": 0.0})
+    cost_usd = (tokens_in / 1_000_000 * cost_info["input"]) + (
+        tokens_out / 1_000_000 * cost_info["output"]
+    )
+    return round(cost_usd, 6)
+
+
+# Rule file contents keyed by path, with the mtime they were read at. Rules
+# are editable through the API, so a changed mtime forces a re-read.
+_RULES_CACHE: dict[Path, tuple[int, str]] = {}
+
+
 def load_rules(stage: str) -> str:
     """Load a rule file for the given stage name (e.g. 'blog-research.md')."""
     from src.pipeline.state import STAGE_RULES_MAP
 
     filename = STAGE_RULES_MAP[stage]
     rules_path = Path(settings.rules_dir) / filename
-    if not rules_path.exists():
+    try:
+        mtime = rules_path.stat().st_mtime_ns
+    except FileNotFoundError:
         logger.warning(f"Rule file not found: {rules_path}")
         return ""
-    return rules_path.read_text(encoding="utf-8")
+    cached = _RULES_CACHE.get(rules_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    rules = rules_path.read_text(encoding="utf-8")
+    _RULES_CACHE[rules_path] = (mtime, rules)
+    return rules
+
+
+# (label, state key) pairs rendered into the Post Configuration block
+_CONFIG_FIELDS: tuple[tuple[str, str], ...] = (
+    ("BLOG_POST_TOPIC", "topic"),
+    ("TARGET_AUDIENCE", "target_audience"),
+    ("NICHE", "niche"),
+    ("INTENT", "intent"),
+    ("ARTICLE_TYPE", "article_type"),
+    ("ADDITIONAL_INFO", "additional_info"),
+    ("WORD_COUNT", "word_count"),
+    ("TONE", "tone"),
+    ("OUTPUT_FORMAT", "output_format"),
+    ("WEBSITE_URL", "website_url"),
+    ("BRAND_VOICE", "brand_voice"),
+    ("AVOID", "avoid"),
+    ("REQUIRED_MENTIONS", "required_mentions"),
+)
 
 
 def build_stage_prompt(stage: str, rules: str, state: PipelineState) -> str:
@@ -175,26 +446,11 @@ def build_stage_prompt(stage: str, rules: str, state: PipelineState) -> str:
 
 def _build_config_context(state: PipelineState) -> str:
     """Build the configuration context block from state."""
-    lines = ["## Post Configuration\n"]
-    fields = [
-        ("BLOG_POST_TOPIC", "topic"),
-        ("TARGET_AUDIENCE", "target_audience"),
-        ("NICHE", "niche"),
-        ("INTENT", "intent"),
-        ("ARTICLE_TYPE", "article_type"),
-        ("ADDITIONAL_INFO", "additional_info"),
-        ("WORD_COUNT", "word_count"),
-        ("TONE", "tone"),
-        ("OUTPUT_FORMAT", "output_format"),
-        ("WEBSITE_URL", "website_url"),
-        ("BRAND_VOICE", "brand_voice"),
-        ("AVOID", "avoid"),
-        ("REQUIRED_MENTIONS", "required_mentions"),
+    lines = ["## Post Configuration\n"] + [
+        f"- **{label}**: {state[key]}"
+        for label, key in _CONFIG_FIELDS
+        if state.get(key)
     ]
-    for label, key in fields:
-        val = state.get(key, "")
-        if val:
-            lines.append(f"- **{label}**: {val}")
 
     kws = state.get("related_keywords", [])
     if kws:
@@ -271,6 +527,8 @@ async def save_stage_output(
     stage: str,
     content: str | dict,
     stage_status: dict | None = None,
+    *,
+    commit: bool = True,
 ) -> None:
     """Sync a stage's output from LangGraph state to the posts table."""
     column = STAGE_CONTENT_MAP.get(stage)
@@ -292,7 +550,8 @@ async def save_stage_output(
 
     stmt = update(Post).where(Post.id == post_id).values(**values)
     await session.execute(stmt)
-    await session.commit()
+    if commit:
+        await session.commit()
 
     logger.info(f"Saved {stage} output for post {post_id}")
 
@@ -305,31 +564,33 @@ async def log_stage_execution(
     tokens_in: int,
     tokens_out: int,
     duration_s: float,
+    *,
+    commit: bool = True,
 ) -> None:
     """Record execution metrics for a stage in the post's stage_logs."""
-    cost_info = MODEL_COSTS.get(model, {"input": 0.0, "output": 0.0})
-    cost_usd = (tokens_in / 1_000_000 * cost_info["input"]) + (
-        tokens_out / 1_000_000 * cost_info["output"]
-    )
+    cost_usd = compute_cost(model, tokens_in, tokens_out)
 
     log_entry = {
         "tokens_in": tokens_in,
         "tokens_out": tokens_out,
         "model": model,
         "duration_s": round(duration_s, 2),
-        "cost_usd": round(cost_usd, 6),
+        "cost_usd": cost_usd,
     }
 
-    # Fetch current logs, merge, and update
-    from sqlalchemy import select
-
-    result = await session.execute(select(Post.stage_logs).where(Post.id == post_id))
-    current_logs = result.scalar_one_or_none() or {}
-    current_logs[stage] = log_entry
-
-    stmt = update(Post).where(Post.id == post_id).values(stage_logs=current_logs)
-    await session.execute(stmt)
-    await session.commit()
+    # Merge server-side so the accumulated stage_logs JSONB never leaves Postgres
+    stmt = text(
+        "UPDATE posts SET stage_logs = jsonb_set("
+        "COALESCE(stage_logs, CAST('{}' AS jsonb)), "
+        "ARRAY[CAST(:stage AS text)], CAST(:entry AS jsonb), true) "
+        "WHERE id = :post_id"
+    )
+    await session.execute(
+        stmt,
+        {"stage": stage, "entry": json.dumps(log_entry), "post_id": str(post_id)},
+    )
+    if commit:
+        await session.commit()
 
     logger.info(
         f"Logged {stage} execution: {tokens_in}in/{tokens_out}out tokens, "
@@ -7,8 +7,12 @@ import logging
 from src.pipeline.helpers import (
     StageTimer,
     build_stage_prompt,
+    claude_chat,
+    get_claude_client,
     load_rules,
     publish_stage_log,
+    stage_meta,
+    stage_result,
 )
 from src.pipeline.state import PipelineState
 from src.services.analytics import compute_analytics
@@ -16,7 +20,7 @@ from src.services.link_validator import (
     ValidationResult,
     validate_links,
 )
-from src.services.llm import ClaudeClient, LLMResponse
+from src.services.llm import LLMResponse
 
 logger = logging.getLogger(__name__)
 
@@ -44,32 +48,33 @@ async def edit_node(state: PipelineState) -> dict:
     # WordPress HTML conversion happens at publish time.
     format_instruction = "Output only the final Markdown with YAML frontmatter."
 
-    client = ClaudeClient(api_key=state.get("api_keys", {}).get("anthropic"))
+    client = get_claude_client(state.get("api_keys", {}).get("anthropic"))
     await publish_stage_log("Calling Claude for editing + SEO polish...", stage="edit")
-    try:
-        with StageTimer() as timer:
-            response: LLMResponse = await client.chat(
-                prompt=prompt,
-                system=(
-                    "You are an expert blog editor and SEO specialist. "
-                    "CRITICAL REQUIREMENTS — violations will cause rejection:\n"
-                    "1. ZERO em-dashes (—) anywhere in output\n"
-                    "2. ZERO line separators (---, ***, ___) between sections\n"
-                    "3. ALL links must be real, working URLs inserted inline\n"
-                    "4. Insert 3-5 internal links from the provided list\n"
-                    "5. Insert 3 external links from authoritative sources\n"
-                    "6. Primary keyword MUST appear in title, "
-                    "first 100 words, and at least one H2\n"
-                    "7. Flesch reading ease MUST be 60-70 "
-                    "- simplify sentences and vocabulary\n"
-                    "8. No filler phrases, no generic AI language\n"
-                    "Fix ALL items marked [FAIL] in the analytics section. "
-                    + format_instruction
-                ),
-                max_tokens=16000,
-            )
-    finally:
-        await client.close()
+    with StageTimer() as timer:
+        response: LLMResponse = await claude_chat(
+            "edit",
+            client,
+            state,
+            prompt=prompt,
+            system=(
+                "You are an expert blog editor and SEO specialist. "
+                "CRITICAL REQUIREMENTS — violations will cause rejection:\n"
+                "1. ZERO em-dashes (—) anywhere in output\n"
+                "2. ZERO line separators (---, ***, ___) between sections\n"
+                "3. ALL links must be real, working URLs inserted inline\n"
+                "4. Insert 3-5 internal links from the provided list\n"
+                "5. Insert 3 external links from authoritative sources\n"
+                "6. Primary keyword MUST appear in title, "
+                "first 100 words, and at least one H2\n"
+                "7. Flesch reading ease MUST be 60-70 "
+                "- simplify sentences and vocabulary\n"
+                "8. No filler phrases, no generic AI language\n"
+                "Fix ALL items marked [FAIL] in the analytics section. "
+                + format_instruction
+            ),
+            max_tokens=16000,
+            cache_prefix=rules,
+        )
 
     await publish_stage_log(
         f"Received {response.tokens_out} tokens in {timer.duration:.1f}s",
@@ -96,23 +101,10 @@ async def edit_node(state: PipelineState) -> dict:
 
     content = validation.content
 
-    meta = {
-        "stage": "edit",
-        "model": response.model,
-        "tokens_in": response.tokens_in,
-        "tokens_out": response.tokens_out,
-        "duration_s": timer.duration,
-    }
-
-    return {
-        "final_md": content,
-        "current_stage": "edit",
-        "stage_status": {
-            **state.get("stage_status", {}),
-            "edit": "complete",
-        },
-        "_stage_meta": meta,
-    }
+    meta = stage_meta(
+        "edit", response.model, response.tokens_in, response.tokens_out, timer.duration
+    )
+    return stage_result("edit", state, content, meta)
 
 
 def _build_analytics_section(state: PipelineState) -> str:
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import io
 import json
 import logging
-import random
+import re
+import secrets
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -16,14 +18,23 @@ from src.config import settings
 from src.pipeline.helpers import (
     StageTimer,
     build_stage_prompt,
+    claude_chat,
+    get_claude_client,
     load_rules,
     publish_stage_log,
+    stage_meta,
+    stage_result,
+    use_claude_batch,
 )
-from src.pipeline.state import PipelineState
-from src.services.llm import ClaudeClient, GeminiClient, ImageGenResponse, LLMResponse
+from src.pipeline.state import STATUS_FAILED, PipelineState
+from src.services.llm import GeminiClient, ImageGenResponse, LLMResponse
 
 logger = logging.getLogger(__name__)
 
+_JSON_DECODER = json.JSONDecoder()
+_RE_IMAGES_ARRAY = re.compile(r'"images"\s*:\s*\[')
+_RE_STYLE_BRIEF = re.compile(r'"style_brief"\s*:\s*')
+
 
 def optimize_image(
     image_bytes: bytes, max_width: int = 1200, quality: int = 82
@@ -39,99 +50,55 @@ def optimize_image(
     return buf.getvalue(), ".webp"
 
 
+def _save_image(
+    image_bytes: bytes, media_dir: Path, stem: str, max_width: int
+) -> tuple[str, int]:
+    """Optimize an image and write it to media_dir. Returns (filename, size)."""
+    optimized, ext = optimize_image(image_bytes, max_width=max_width)
+    filename = stem + ext
+    (media_dir / filename).write_bytes(optimized)
+    return filename, len(optimized)
+
+
 async def images_node(state: PipelineState) -> dict:
     """Execute the images stage.
 
     Step 1: Use Claude to generate an image manifest (prompts, placements, alt text)
     Step 2: Use Gemini to generate each image from the manifest
+
+    The manifest is streamed, and each image spec starts generating as soon as
+    it has been emitted, so Gemini work overlaps the rest of the manifest.
     """
     logger.info(f"Images stage starting for post {state.get('post_id')}")
 
     # Timer wraps the entire stage (manifest + all image generation)
     with StageTimer() as timer:
-        # Step 1: Generate image manifest via Claude
         rules = load_rules("images")
         await publish_stage_log("Rules loaded, building prompt...", stage="images")
         prompt = build_stage_prompt("images", rules, state)
 
-        claude = ClaudeClient(api_key=state.get("api_keys", {}).get("anthropic"))
-        await publish_stage_log("Calling Claude for image manifest...", stage="images")
-        try:
-            response: LLMResponse = await claude.chat(
-                prompt=prompt,
-                system=(
-                    "You are an expert at crafting image generation "
-                    "prompts. Create a JSON image manifest with "
-                    "detailed prompts for each image placement. "
-                    "Output ONLY valid JSON, no code fences."
-                ),
-                max_tokens=8000,
-            )
-        finally:
-            await claude.close()
-
-        await publish_stage_log(
-            f"Manifest received ({response.tokens_out} tokens)",
-            stage="images",
-        )
-
-        # Parse manifest JSON from response
-        manifest = _parse_manifest(response.content)
-
-        if manifest.get("error"):
-            error_msg = manifest["error"]
-            raw_snippet = response.content[:500]
-            await publish_stage_log(
-                f"Manifest parse failed: {error_msg}",
-                stage="images",
-                level="warning",
-                event="log",
-                data={"error": error_msg, "raw_snippet": raw_snippet},
-            )
-            meta = {
-                "stage": "images",
-                "model": response.model,
-                "tokens_in": response.tokens_in,
-                "tokens_out": response.tokens_out,
-                "duration_s": timer.duration,
-            }
-            return {
-                "image_manifest": manifest,
-                "current_stage": "images",
-                "stage_status": {
-                    **state.get("stage_status", {}),
-                    "images": "failed",
-                },
-                "_stage_meta": meta,
-            }
-
-        # Step 2: Generate images via Gemini
-        num_images = len(manifest.get("images", []))
-        await publish_stage_log(
-            f"Generating {num_images} images via Gemini...", stage="images"
-        )
+        claude = get_claude_client(state.get("api_keys", {}).get("anthropic"))
+        gemini = GeminiClient(api_key=state.get("api_keys", {}).get("gemini"))
         post_id = state.get("post_id", "unknown")
         media_dir = Path(settings.media_dir) / post_id
         media_dir.mkdir(parents=True, exist_ok=True)
 
-        gemini = GeminiClient(api_key=state.get("api_keys", {}).get("gemini"))
-        sem = asyncio.Semaphore(3)
+        sem = asyncio.Semaphore(settings.gemini_concurrency)
         # Accumulate Gemini token usage across all image generation calls
         gemini_tokens_in = 0
         gemini_tokens_out = 0
         gemini_model = "gemini-3.1-flash-image-preview"
 
+        # Featured filenames get one timestamp for the batch and a random hex
+        # suffix per image so concurrent tasks can't collide
+        date_str = datetime.now(UTC).strftime("%m%d%y")
+        featured_stems: dict[int, str] = {}
+        tasks: list[asyncio.Task] = []
+        scheduled: list[dict] = []  # specs behind `tasks`, same order
+
         async def _generate_one(i: int, image_spec: dict) -> dict:
             nonlocal gemini_tokens_in, gemini_tokens_out, gemini_model
-            image_prompt = image_spec.get("prompt", "")
-            if not image_prompt:
-                return {
-                    **image_spec,
-                    "generated": False,
-                    "error": "no prompt",
-                    "index": i,
-                }
-
+            image_prompt = image_spec["prompt"]
             aspect_ratio = image_spec.get("aspect_ratio", "4:3")
             image_size = image_spec.get("image_size", "1K")
 
@@ -140,75 +107,190 @@ async def images_node(state: PipelineState) -> dict:
                 if "aspect_ratio" not in image_spec:
                     aspect_ratio = "16:9"
 
-            async with sem:
-                try:
+            try:
+                # Only the Gemini call is rate-limited; optimizing and saving
+                # one image overlaps with the next image's generation
+                async with sem:
                     gen_response: ImageGenResponse = await gemini.generate_image(
                         prompt=image_prompt,
                         aspect_ratio=aspect_ratio,
                         image_size=image_size,
                     )
-                    image_bytes = gen_response.image_bytes
-                    gemini_tokens_in += gen_response.tokens_in
-                    gemini_tokens_out += gen_response.tokens_out
-                    gemini_model = gen_response.model
-
-                    # Optimize: resize + convert to WebP
-                    is_featured = (
-                        image_spec.get("placement") == "featured"
-                        or image_spec.get("type") == "featured"
-                    )
-                    opt_width = 1920 if is_featured else 1200
-                    image_bytes, ext = optimize_image(
-                        image_bytes, max_width=opt_width
+                image_bytes = gen_response.image_bytes
+                gemini_tokens_in += gen_response.tokens_in
+                gemini_tokens_out += gen_response.tokens_out
+                gemini_model = gen_response.model
+
+                # Override featured image filename with date+random suffix
+                is_featured = i in featured_stems
+                if is_featured:
+                    stem = featured_stems[i]
+                else:
+                    stem = Path(image_spec.get("filename", f"image-{i}.png")).stem
+
+                # Optimize + write in one worker-thread hop (CPU + disk, off the loop)
+                save = asyncio.ensure_future(
+                    asyncio.to_thread(
+                        _save_image,
+                        image_bytes,
+                        media_dir,
+                        stem,
+                        1920 if is_featured else 1200,
                     )
+                )
+                try:
+                    filename, size_bytes = await asyncio.shield(save)
+                except asyncio.CancelledError:
+                    # The thread can't be interrupted: wait out the write, then
+                    # remove the file so a cancelled image leaves nothing behind
+                    with contextlib.suppress(Exception):
+                        filename, _ = await save
+                        (media_dir / filename).unlink(missing_ok=True)
+                    raise
+                image_url = f"/media/{post_id}/{filename}"
+
+                await publish_stage_log(
+                    f"Image {i} generated ({size_bytes} bytes)",
+                    stage="images",
+                    event="image_generated",
+                    data={"index": i, "bytes": size_bytes, "path": image_url},
+                )
+                return {
+                    **image_spec,
+                    "generated": True,
+                    "size_bytes": size_bytes,
+                    "url": image_url,
+                    "index": i,
+                }
+            except Exception as e:
+                logger.error(f"Failed to generate image {i}: {e}")
+                await publish_stage_log(
+                    f"Image {i} failed: {e}",
+                    stage="images",
+                    level="error",
+                    event="image_failed",
+                    data={"index": i, "error": str(e)},
+                )
+                return {
+                    **image_spec,
+                    "generated": False,
+                    "error": str(e),
+                    "index": i,
+                }
 
-                    filename = image_spec.get("filename", f"image-{i}.png")
-                    # Swap extension to .webp
-                    filename = Path(filename).stem + ext
-
-                    # Override featured image filename with date+random suffix
-                    if is_featured:
-                        now = datetime.now(UTC)
-                        date_str = now.strftime("%m%d%y")
-                        rand_digits = f"{random.randint(10, 99)}"
-                        filename = f"featured-{date_str}-{rand_digits}{ext}"
-                    image_path = media_dir / filename
-                    image_path.write_bytes(image_bytes)
-                    image_url = f"/media/{post_id}/{filename}"
-
-                    await publish_stage_log(
-                        f"Image {i} generated ({len(image_bytes)} bytes)",
-                        stage="images",
-                        event="image_generated",
-                        data={"index": i, "bytes": len(image_bytes), "path": image_url},
-                    )
-                    return {
-                        **image_spec,
-                        "generated": True,
-                        "size_bytes": len(image_bytes),
-                        "url": image_url,
-                        "index": i,
-                    }
-                except Exception as e:
-                    logger.error(f"Failed to generate image {i}: {e}")
-                    await publish_stage_log(
-                        f"Image {i} failed: {e}",
-                        stage="images",
-                        level="error",
-                        event="image_failed",
-                        data={"index": i, "error": str(e)},
-                    )
-                    return {
-                        **image_spec,
-                        "generated": False,
-                        "error": str(e),
-                        "index": i,
-                    }
-
-        tasks = [
-            _generate_one(i, spec) for i, spec in enumerate(manifest.get("images", []))
-        ]
+        def _schedule(image_spec: dict) -> None:
+            i = len(tasks)
+            if (
+                image_spec.get("placement") == "featured"
+                or image_spec.get("type") == "featured"
+            ):
+                featured_stems[i] = f"featured-{date_str}-{secrets.token_hex(2)}"
+            scheduled.append(image_spec)
+            tasks.append(asyncio.create_task(_generate_one(i, image_spec)))
+
+        # Step 1: Generate image manifest via Claude
+        system = (
+            "You are an expert at crafting image generation "
+            "prompts. Create a JSON image manifest with "
+            "detailed prompts for each image placement. "
+            "Output ONLY valid JSON, no code fences."
+        )
+        await publish_stage_log("Calling Claude for image manifest...", stage="images")
+        try:
+            if use_claude_batch("images", state):
+                # Batched calls can't stream; generation starts after parsing
+                response: LLMResponse = await claude_chat(
+                    "images",
+                    claude,
+                    state,
+                    prompt=prompt,
+                    system=system,
+                    max_tokens=8000,
+                    cache_prefix=rules,
+                )
+            else:
+                manifest_stream = _ManifestStream()
+
+                def _on_text(chunk: str) -> None:
+                    for image_spec in manifest_stream.feed(chunk):
+                        _schedule(image_spec)
+
+                response = await claude.stream(
+                    prompt=prompt,
+                    on_text=_on_text,
+                    system=system,
+                    max_tokens=8000,
+                    cache_prefix=rules,
+                )
+        except BaseException:
+            await _discard_image_tasks(tasks, media_dir)
+            raise
+
+        await publish_stage_log(
+            f"Manifest received ({response.tokens_out} tokens)",
+            stage="images",
+        )
+
+        # Parse the full manifest (style brief, validation, anything not streamed)
+        manifest = _parse_manifest(response.content)
+
+        if manifest.get("error"):
+            await _discard_image_tasks(tasks, media_dir)
+            error_msg = manifest["error"]
+            raw_snippet = response.content[:500]
+            await publish_stage_log(
+                f"Manifest parse failed: {error_msg}",
+                stage="images",
+                level="warning",
+                event="log",
+                data={"error": error_msg, "raw_snippet": raw_snippet},
+            )
+            meta = stage_meta(
+                "images",
+                response.model,
+                response.tokens_in,
+                response.tokens_out,
+                timer.duration,
+            )
+            return stage_result("images", state, manifest, meta, STATUS_FAILED)
+
+        if manifest.get("truncated"):
+            await publish_stage_log(
+                f"Manifest was truncated; recovered {len(manifest['images'])} "
+                "complete image specs",
+                stage="images",
+                level="warning",
+            )
+
+        # Step 2: Generate images via Gemini (streamed specs are already running)
+        manifest_images = manifest.get("images", [])
+        image_specs = [s for s in manifest_images if _is_image_spec(s)]
+        if image_specs[: len(scheduled)] != scheduled:
+            # The stream and the parsed manifest disagree: trust the parse
+            logger.warning("Streamed image specs differ from manifest; restarting")
+            await _discard_image_tasks(tasks, media_dir)
+            tasks.clear()
+            scheduled.clear()
+            featured_stems.clear()
+        for image_spec in image_specs[len(scheduled) :]:
+            _schedule(image_spec)
+        await publish_stage_log(
+            f"Generating {len(tasks)} images via Gemini...", stage="images"
+        )
         generated_images = list(await asyncio.gather(*tasks))
+        # Specs that couldn't be scheduled still show up as failed entries
+        generated_images += [
+            {
+                **(spec if isinstance(spec, dict) else {}),
+                "generated": False,
+                "error": "no prompt",
+                "index": i,
+            }
+            for i, spec in enumerate(
+                (s for s in manifest_images if not _is_image_spec(s)),
+                start=len(generated_images),
+            )
+        ]
 
         manifest["images"] = generated_images
         manifest["total_generated"] = sum(
@@ -218,33 +300,46 @@ async def images_node(state: PipelineState) -> dict:
             1 for img in generated_images if not img.get("generated")
         )
 
-    meta = {
-        "stage": "images",
-        "model": response.model,
-        "tokens_in": response.tokens_in,
-        "tokens_out": response.tokens_out,
-        "duration_s": timer.duration,
-    }
-
+    meta = stage_meta(
+        "images",
+        response.model,
+        response.tokens_in,
+        response.tokens_out,
+        timer.duration,
+    )
+    result = stage_result("images", state, manifest, meta)
     # Separate Gemini image generation cost tracking
-    gemini_meta = {
-        "stage": "images_gemini",
-        "model": gemini_model,
-        "tokens_in": gemini_tokens_in,
-        "tokens_out": gemini_tokens_out,
-        "duration_s": timer.duration,
-    }
-
-    return {
-        "image_manifest": manifest,
-        "current_stage": "images",
-        "stage_status": {
-            **state.get("stage_status", {}),
-            "images": "complete",
-        },
-        "_stage_meta": meta,
-        "_stage_meta_gemini": gemini_meta,
-    }
+    result["_stage_meta_gemini"] = stage_meta(
+        "images_gemini",
+        gemini_model,
+        gemini_tokens_in,
+        gemini_tokens_out,
+        timer.duration,
+    )
+    return result
+
+
+async def _discard_image_tasks(tasks: list[asyncio.Task], media_dir: Path) -> None:
+    """Cancel image tasks, wait for them, and delete the files they wrote.
+
+    Once this returns no task is still writing into media_dir, and images that
+    finished before the cancel don't linger as orphaned files.
+    """
+    for task in tasks:
+        task.cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, dict) and result.get("generated"):
+            (media_dir / Path(result["url"]).name).unlink(missing_ok=True)
+
+
+def _is_image_spec(spec: object) -> bool:
+    """Whether a manifest `images` element can be generated (a dict with a prompt).
+
+    The streamed, recovered and fully parsed manifests all filter with this,
+    so the specs started mid-stream line up with the final list.
+    """
+    return isinstance(spec, dict) and bool(spec.get("prompt"))
 
 
 def _parse_manifest(content: str) -> dict:
@@ -260,5 +355,97 @@ def _parse_manifest(content: str) -> dict:
     try:
         return json.loads(text)
     except json.JSONDecodeError:
+        recovered = _recover_truncated_manifest(text)
+        if recovered is not None:
+            return recovered
         logger.warning("Failed to parse image manifest JSON, returning empty manifest")
         return {"images": [], "style_brief": {}, "error": "Failed to parse manifest"}
+
+
+def _recover_truncated_manifest(text: str) -> dict | None:
+    """Salvage the complete image specs from a manifest cut off mid-output.
+
+    Claude can hit max_tokens partway through the images array. Decode the
+    array one element at a time and keep every spec that was fully emitted
+    (see _is_image_spec); returns None if nothing usable was found.
+    """
+    match = _RE_IMAGES_ARRAY.search(text)
+    if match is None:
+        return None
+
+    images: list[dict] = []
+    pos = end = match.end()
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text) or text[pos] == "]":
+            break
+        try:
+            spec, pos = _JSON_DECODER.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            break
+        end = pos
+        if _is_image_spec(spec):
+            images.append(spec)
+
+    if not images:
+        return None
+
+    style_brief: dict = {}
+    brief_match = _RE_STYLE_BRIEF.search(text)
+    if brief_match is not None:
+        try:
+            brief, _ = _JSON_DECODER.raw_decode(text, brief_match.end())
+        except json.JSONDecodeError:
+            brief = None
+        if isinstance(brief, dict):
+            style_brief = brief
+
+    logger.warning(
+        f"Recovered {len(images)} image specs from truncated manifest "
+        f"({len(text) - end} trailing chars dropped)"
+    )
+    return {"images": images, "style_brief": style_brief, "truncated": True}
+
+
+class _ManifestStream:
+    """Incrementally pull complete image specs out of a streamed manifest.
+
+    feed() takes each text delta and returns the image specs (see
+    _is_image_spec) that became complete with it, in order.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos: int | None = None  # next unparsed index inside the array
+        self._done = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        self._buf += chunk
+        if self._done:
+            return []
+        if self._pos is None:
+            match = _RE_IMAGES_ARRAY.search(self._buf)
+            if match is None:
+                return []
+            self._pos = match.end()
+
+        specs: list[dict] = []
+        buf = self._buf
+        while True:
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                break
+            if buf[pos] == "]":
+                self._done = True
+                break
+            try:
+                spec, end = _JSON_DECODER.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # element still incomplete; wait for more text
+            self._pos = end
+            if _is_image_spec(spec):
+                specs.append(spec)
+        return specs
@@ -4,14 +4,19 @@ from __future__ import annotations
 
 import json
 import logging
+from datetime import UTC, datetime
 
 from src.pipeline.helpers import (
     StageTimer,
+    claude_chat,
+    get_claude_client,
     load_rules,
     publish_stage_log,
+    stage_meta,
+    stage_result,
 )
 from src.pipeline.state import PipelineState
-from src.services.llm import ClaudeClient, LLMResponse
+from src.services.llm import LLMResponse
 
 logger = logging.getLogger(__name__)
 
@@ -30,46 +35,34 @@ async def ready_node(state: PipelineState) -> dict:
 
     prompt = _build_ready_prompt(rules, state)
 
-    claude = ClaudeClient(api_key=state.get("api_keys", {}).get("anthropic"))
+    claude = get_claude_client(state.get("api_keys", {}).get("anthropic"))
     await publish_stage_log("Calling Claude for final assembly...", stage="ready")
-    try:
-        with StageTimer() as timer:
-            response: LLMResponse = await claude.chat(
-                prompt=prompt,
-                system=(
-                    "You are a publishing specialist. Compose the final "
-                    "publication-ready article by inserting images at strategic "
-                    "placements, reformatting the frontmatter, and stripping "
-                    "publishing notes. Output ONLY the final article content, "
-                    "no explanations or commentary."
-                ),
-                max_tokens=16000,
-            )
-    finally:
-        await claude.close()
+    with StageTimer() as timer:
+        response: LLMResponse = await claude_chat(
+            "ready",
+            claude,
+            state,
+            prompt=prompt,
+            system=(
+                "You are a publishing specialist. Compose the final "
+                "publication-ready article by inserting images at strategic "
+                "placements, reformatting the frontmatter, and stripping "
+                "publishing notes. Output ONLY the final article content, "
+                "no explanations or commentary."
+            ),
+            max_tokens=16000,
+            cache_prefix=rules,
+        )
 
     await publish_stage_log(
         f"Assembly done ({response.tokens_out} tokens, {timer.duration:.1f}s)",
         stage="ready",
     )
 
-    meta = {
-        "stage": "ready",
-        "model": response.model,
-        "tokens_in": response.tokens_in,
-        "tokens_out": response.tokens_out,
-        "duration_s": timer.duration,
-    }
-
-    return {
-        "ready": response.content,
-        "current_stage": "ready",
-        "stage_status": {
-            **state.get("stage_status", {}),
-            "ready": "complete",
-        },
-        "_stage_meta": meta,
-    }
+    meta = stage_meta(
+        "ready", response.model, response.tokens_in, response.tokens_out, timer.duration
+    )
+    return stage_result("ready", state, response.content, meta)
 
 
 def _build_ready_prompt(rules: str, state: PipelineState) -> str:
@@ -80,8 +73,6 @@ def _build_ready_prompt(rules: str, state: PipelineState) -> str:
         sections.append(rules)
 
     # Post config
-    from datetime import UTC, datetime
-
     sections.append(
         f"## Post Configuration\n\n- **SLUG**: {state.get('slug', '')}\n"
         f"- **OUTPUT_FORMAT**: {state.get('output_format', 'markdown')}\n"
@@ -99,9 +90,11 @@ def _build_ready_prompt(rules: str, state: PipelineState) -> str:
         images = manifest.get("images", [])
         generated_images = [img for img in images if img.get("generated", False)]
         filtered_manifest = {**manifest, "images": generated_images}
+        # Keep non-ASCII alt text/prompts literal; \u escapes cost prompt tokens
+        manifest_json = json.dumps(filtered_manifest, indent=2, ensure_ascii=False)
         sections.append(
             f"## Image Manifest (generated images only)\n\n"
-            f"```json\n{json.dumps(filtered_manifest, indent=2)}\n```"
+            f"```json\n{manifest_json}\n```"
         )
 
     return "\n\n---\n\n".join(sections)
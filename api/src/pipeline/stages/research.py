@@ -8,11 +8,14 @@ import re
 from src.pipeline.helpers import (
     StageTimer,
     build_stage_prompt,
+    get_perplexity_client,
     load_rules,
     publish_stage_log,
+    stage_meta,
+    stage_result,
 )
 from src.pipeline.state import PipelineState
-from src.services.llm import LLMResponse, PerplexityClient
+from src.services.llm import LLMResponse
 
 logger = logging.getLogger(__name__)
 
@@ -62,58 +65,55 @@ async def research_node(state: PipelineState) -> dict:
         "Produce the complete research directly."
     )
 
-    client = PerplexityClient(api_key=state.get("api_keys", {}).get("perplexity"))
-    try:
-        response: LLMResponse | None = None
-        total_tokens_in = 0
-        total_tokens_out = 0
-        total_duration = 0.0
-
-        for attempt in range(1, MAX_RESEARCH_ATTEMPTS + 1):
-            msg = (
-                f"Calling Perplexity sonar-pro "
-                f"(attempt {attempt}/{MAX_RESEARCH_ATTEMPTS})..."
-                if attempt > 1
-                else "Calling Perplexity sonar-pro..."
+    client = get_perplexity_client(state.get("api_keys", {}).get("perplexity"))
+    response: LLMResponse | None = None
+    total_tokens_in = 0
+    total_tokens_out = 0
+    total_duration = 0.0
+
+    for attempt in range(1, MAX_RESEARCH_ATTEMPTS + 1):
+        msg = (
+            f"Calling Perplexity sonar-pro "
+            f"(attempt {attempt}/{MAX_RESEARCH_ATTEMPTS})..."
+            if attempt > 1
+            else "Calling Perplexity sonar-pro..."
+        )
+        await publish_stage_log(msg, stage="research")
+
+        with StageTimer() as timer:
+            response = await client.chat(
+                prompt=prompt if attempt == 1 else _reinforced_prompt(prompt),
+                system=system_msg,
             )
-            await publish_stage_log(msg, stage="research")
 
-            with StageTimer() as timer:
-                response = await client.chat(
-                    prompt=prompt if attempt == 1 else _reinforced_prompt(prompt),
-                    system=system_msg,
-                )
-
-            total_tokens_in += response.tokens_in
-            total_tokens_out += response.tokens_out
-            total_duration += timer.duration
-
-            if _is_valid_research(response.content):
-                break
-
-            logger.warning(
-                f"Research attempt {attempt} returned meta-response, "
-                f"retrying... (tokens: {response.tokens_out})"
-            )
-            await publish_stage_log(
-                f"Response validation failed (attempt {attempt}), retrying...",
-                stage="research",
-                level="warning",
-            )
-        else:
-            # All attempts returned invalid responses — use last response but log error
-            logger.error(
-                "All research attempts returned meta-responses. "
-                "Using last response as fallback."
-            )
-            await publish_stage_log(
-                "WARNING: Research quality may be degraded — "
-                "Perplexity returned unexpected responses.",
-                stage="research",
-                level="error",
-            )
-    finally:
-        await client.close()
+        total_tokens_in += response.tokens_in
+        total_tokens_out += response.tokens_out
+        total_duration += timer.duration
+
+        if _is_valid_research(response.content):
+            break
+
+        logger.warning(
+            f"Research attempt {attempt} returned meta-response, "
+            f"retrying... (tokens: {response.tokens_out})"
+        )
+        await publish_stage_log(
+            f"Response validation failed (attempt {attempt}), retrying...",
+            stage="research",
+            level="warning",
+        )
+    else:
+        # All attempts returned invalid responses — use last response but log error
+        logger.error(
+            "All research attempts returned meta-responses. "
+            "Using last response as fallback."
+        )
+        await publish_stage_log(
+            "WARNING: Research quality may be degraded — "
+            "Perplexity returned unexpected responses.",
+            stage="research",
+            level="error",
+        )
 
     assert response is not None  # guaranteed by loop
 
@@ -122,23 +122,10 @@ async def research_node(state: PipelineState) -> dict:
         stage="research",
     )
 
-    meta = {
-        "stage": "research",
-        "model": response.model,
-        "tokens_in": total_tokens_in,
-        "tokens_out": total_tokens_out,
-        "duration_s": total_duration,
-    }
-
-    return {
-        "research": response.content,
-        "current_stage": "research",
-        "stage_status": {
-            **state.get("stage_status", {}),
-            "research": "complete",
-        },
-        "_stage_meta": meta,
-    }
+    meta = stage_meta(
+        "research", response.model, total_tokens_in, total_tokens_out, total_duration
+    )
+    return stage_result("research", state, response.content, meta)
 
 
 def _reinforced_prompt(original_prompt: str) -> str:
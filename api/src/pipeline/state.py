@@ -102,6 +102,7 @@ class PipelineState(TypedDict, total=False):
 
     # Per-stage execution metadata (set by node, read by worker)
     _stage_meta: dict
+    _stage_meta_gemini: dict
 
 
 def state_from_post(post, internal_links: list[dict] | None = None) -> PipelineState:
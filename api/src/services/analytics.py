@@ -1,10 +1,43 @@
 """Content analytics computation: readability, keyword density, SEO checks."""
 
 import re
+from collections import Counter
 from dataclasses import dataclass, field
+from urllib.parse import urlparse
 
 import textstat
 
+# Outer code fence the LLM sometimes wraps its output in
+_RE_FENCE_OPEN = re.compile(r"^```(?:markdown|md)?\s*\n")
+_RE_FENCE_CLOSE = re.compile(r"\n```\s*$")
+
+# SEO checklist patterns
+_RE_H2 = re.compile(r"^##\s+(.+)$", re.MULTILINE)
+_RE_LINK = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_RE_META_DESCRIPTION = re.compile(r"^description:\s*.+", re.MULTILINE)
+
+# _strip_markdown: one alternation, longest constructs first so code and
+# link syntax win over the emphasis/heading markers inside them. The
+# lookahead lets the scanner skip plain prose without trying each branch.
+_RE_MARKDOWN = re.compile(
+    r"(?=[-`!\[<#>*_])"
+    r"(?:(?P<frontmatter>\A---\n(?s:.*?)\n---\n)"
+    r"|(?P<code_block>```[\s\S]*?```)"
+    r"|(?P<inline_code>`[^`]+`)"
+    r"|!\[(?P<image>[^\]]*)\]\([^)]+\)"
+    r"|\[(?P<link>[^\]]+)\]\([^)]+\)"
+    r"|(?P<html><[^>]+>)"
+    r"|(?P<heading>^#{1,6}\s+)"
+    r"|(?P<blockquote>^>\s+)"
+    r"|(?P<emphasis>[*_]{1,3}))",
+    re.MULTILINE,
+)
+_RE_EMPHASIS = re.compile(r"[*_]{1,3}")
+_RE_BLANK_LINES = re.compile(r"\n{3,}")
+
+# Word tokens for keyword matching (keeps contractions like "don't" whole)
+_RE_TOKEN = re.compile(r"[\w']+")
+
 
 @dataclass
 class ContentAnalytics:
@@ -29,8 +62,8 @@ def compute_analytics(
         return ContentAnalytics()
 
     # Unwrap outer code fence before any analysis (LLM wraps in ```markdown)
-    content = re.sub(r"^```(?:markdown|md)?\s*\n", "", content.strip())
-    content = re.sub(r"\n```\s*$", "", content)
+    content = _RE_FENCE_OPEN.sub("", content.strip())
+    content = _RE_FENCE_CLOSE.sub("", content)
 
     # Strip markdown formatting for text analysis
     plain = _strip_markdown(content)
@@ -38,31 +71,20 @@ def compute_analytics(
     words = plain.split()
     word_count = len(words)
 
+    # textstat (>=0.7.6) memoizes its per-text counts, so Flesch reuses the
+    # sentence/word tokenisation done by sentence_count instead of redoing it
     sentences = textstat.sentence_count(plain)
+    flesch = textstat.flesch_reading_ease(plain)
     paragraphs = len([p for p in content.split("\n\n") if p.strip()])
 
     avg_sentence_length = word_count / sentences if sentences > 0 else 0.0
-    flesch = textstat.flesch_reading_ease(plain)
 
     # Keyword density
-    density: dict[str, float] = {}
-    if primary_keyword and word_count > 0:
-        pk_lower = primary_keyword.lower()
-        plain_lower = plain.lower()
-        pk_count = plain_lower.count(pk_lower)
-        # Count words in keyword phrase
-        pk_words = len(pk_lower.split())
-        density[primary_keyword] = round((pk_count * pk_words / word_count) * 100, 2)
-
-    for kw in secondary_keywords or []:
-        if kw and word_count > 0:
-            kw_lower = kw.lower()
-            kw_count = plain.lower().count(kw_lower)
-            kw_words = len(kw_lower.split())
-            density[kw] = round((kw_count * kw_words / word_count) * 100, 2)
+    keywords = [primary_keyword, *(secondary_keywords or [])]
+    density = _keyword_density(plain, word_count, [kw for kw in keywords if kw])
 
     # SEO checklist
-    seo = _seo_checklist(content, plain, title, primary_keyword, website_url)
+    seo = _seo_checklist(content, words, title, primary_keyword, website_url)
 
     return ContentAnalytics(
         word_count=word_count,
@@ -75,16 +97,43 @@ def compute_analytics(
     )
 
 
+def _keyword_density(
+    plain: str, word_count: int, keywords: list[str]
+) -> dict[str, float]:
+    """Percentage of words covered by each keyword, matched on whole words.
+
+    The text is tokenised once; each keyword is then a lookup in an n-gram
+    Counter sized to its word count (built lazily, one per distinct size).
+    """
+    if not keywords or word_count == 0:
+        return {}
+
+    tokens = _RE_TOKEN.findall(plain.lower())
+    ngrams: dict[int, Counter[tuple[str, ...]]] = {}
+    density: dict[str, float] = {}
+    for kw in keywords:
+        parts = tuple(_RE_TOKEN.findall(kw.lower()))
+        n = len(parts)
+        if n and n not in ngrams:
+            ngrams[n] = Counter(zip(*(tokens[i:] for i in range(n))))
+        count = ngrams[n][parts] if n else 0
+        # Weight by whitespace words, matching how word_count is measured
+        density[kw] = round((count * len(kw.split()) / word_count) * 100, 2)
+    return density
+
+
 def _seo_checklist(
     markdown: str,
-    plain: str,
+    words: list[str],
     title: str,
     primary_keyword: str,
     website_url: str = "",
 ) -> dict[str, bool]:
-    """Run SEO checks against content."""
-    from urllib.parse import urlparse
+    """Run SEO checks against content.
 
+    `words` is the whitespace-split plain text already computed by
+    compute_analytics, so the body isn't tokenised a second time.
+    """
     checks: dict[str, bool] = {}
     pk_lower = primary_keyword.lower() if primary_keyword else ""
 
@@ -92,12 +141,11 @@ def _seo_checklist(
     checks["keyword_in_title"] = bool(pk_lower and pk_lower in title.lower())
 
     # Keyword in first 100 words
-    first_100 = " ".join(plain.split()[:100]).lower()
+    first_100 = " ".join(words[:100]).lower()
     checks["keyword_in_first_100_words"] = bool(pk_lower and pk_lower in first_100)
 
     # Keyword in H2s
-    h2_pattern = re.compile(r"^##\s+(.+)$", re.MULTILINE)
-    h2s = h2_pattern.findall(markdown)
+    h2s = _RE_H2.findall(markdown)
     checks["keyword_in_h2"] = bool(
         pk_lower and any(pk_lower in h2.lower() for h2 in h2s)
     )
@@ -105,55 +153,39 @@ def _seo_checklist(
     # Has H2 headings
     checks["has_h2_headings"] = len(h2s) > 0
 
-    # Internal links (markdown links) — domain-aware classification
+    # Internal links (markdown links) — domain-aware classification,
+    # one pass over the links and one urlparse per link
     domain = urlparse(website_url).netloc if website_url else ""
-    link_pattern = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
-    links = link_pattern.findall(markdown)
-    internal_links = [
-        url
-        for _, url in links
-        if url.startswith("/")
-        or url.startswith("#")
-        or (domain and domain in urlparse(url).netloc)
-    ]
-    external_links = [
-        url
-        for _, url in links
-        if url.startswith("http") and not (domain and domain in urlparse(url).netloc)
-    ]
-    checks["has_internal_links"] = len(internal_links) >= 1
-    checks["has_external_links"] = len(external_links) >= 1
-    checks["internal_link_count"] = len(internal_links)  # type: ignore[assignment]
-    checks["external_link_count"] = len(external_links)  # type: ignore[assignment]
+    internal_count = 0
+    external_count = 0
+    for _, url in _RE_LINK.findall(markdown):
+        on_domain = bool(domain) and domain in urlparse(url).netloc
+        if url.startswith(("/", "#")) or on_domain:
+            internal_count += 1
+        elif url.startswith("http"):
+            external_count += 1
+    checks["has_internal_links"] = internal_count >= 1
+    checks["has_external_links"] = external_count >= 1
+    checks["internal_link_count"] = internal_count  # type: ignore[assignment]
+    checks["external_link_count"] = external_count  # type: ignore[assignment]
 
     # Meta description (check for YAML frontmatter description field)
-    checks["has_meta_description"] = bool(
-        re.search(r"^description:\s*.+", markdown, re.MULTILINE)
-    )
+    checks["has_meta_description"] = bool(_RE_META_DESCRIPTION.search(markdown))
 
     return checks
 
 
+def _markdown_replacement(match: re.Match[str]) -> str:
+    """Keep the visible text of images and links; drop everything else."""
+    kind = match.lastgroup
+    if kind in ("image", "link"):
+        return _RE_EMPHASIS.sub("", match.group(kind))
+    return ""
+
+
 def _strip_markdown(text: str) -> str:
     """Remove markdown formatting for plain text analysis."""
-    # Remove YAML frontmatter
-    text = re.sub(r"^---\n.*?\n---\n", "", text, flags=re.DOTALL)
-    # Remove HTML tags
-    text = re.sub(r"<[^>]+>", "", text)
-    # Remove markdown headings
-    text = re.sub(r"^#{1,6}\s+", "", text, flags=re.MULTILINE)
-    # Remove bold/italic markers
-    text = re.sub(r"[*_]{1,3}", "", text)
-    # Remove image syntax (before links to avoid partial match)
-    text = re.sub(r"!\[([^\]]*)\]\([^)]+\)", r"\1", text)
-    # Remove link syntax but keep text
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
-    # Remove code blocks
-    text = re.sub(r"```[\s\S]*?```", "", text)
-    # Remove inline code
-    text = re.sub(r"`[^`]+`", "", text)
-    # Remove blockquotes
-    text = re.sub(r"^>\s+", "", text, flags=re.MULTILINE)
+    text = _RE_MARKDOWN.sub(_markdown_replacement, text)
     # Collapse whitespace
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _RE_BLANK_LINES.sub("\n\n", text)
     return text.strip()
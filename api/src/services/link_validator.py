@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
+import time
 from dataclasses import dataclass, field
 
 import httpx
@@ -20,8 +21,20 @@ _HTML_LINK_RE = re.compile(r'<a\s[^>]*href="([^"]+)"[^>]*>(.*?)</a>', re.IGNOREC
 # HTTP status codes that indicate a confirmed dead link
 _DEAD_STATUSES = {404, 410, 451}
 
-_SEMAPHORE_LIMIT = 5
+# Statuses some servers return for HEAD while serving GET fine
+_HEAD_REJECTED_STATUSES = {403, 405}
+
+_SEMAPHORE_LIMIT = 20
 _REQUEST_TIMEOUT = 10
+_USER_AGENT = "pipeline-linkcheck/1.0"
+
+# URL -> (status, checked_at); shared across pipeline runs in the worker
+_STATUS_CACHE: dict[str, tuple[int, float]] = {}
+_STATUS_CACHE_TTL = 3600
+_STATUS_CACHE_MAX = 2048
+
+# Pooled client reused across validate_links calls (keep-alive connections)
+_client: httpx.AsyncClient | None = None
 
 
 @dataclass
@@ -37,18 +50,68 @@ class ValidationResult:
     removed: list[RemovedLink] = field(default_factory=list)
 
 
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared link-check client, creating it on first use."""
+    global _client  # noqa: PLW0603
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=_REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            headers={"User-Agent": _USER_AGENT},
+        )
+    return _client
+
+
+async def close_link_client() -> None:
+    """Close the shared link-check client (called on worker shutdown)."""
+    global _client  # noqa: PLW0603
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+def _cached_status(url: str) -> int | None:
+    entry = _STATUS_CACHE.get(url)
+    if entry is None:
+        return None
+    status, checked_at = entry
+    if time.monotonic() - checked_at > _STATUS_CACHE_TTL:
+        del _STATUS_CACHE[url]
+        return None
+    return status
+
+
+def _cache_status(url: str, status: int) -> None:
+    if len(_STATUS_CACHE) >= _STATUS_CACHE_MAX:
+        _STATUS_CACHE.pop(next(iter(_STATUS_CACHE)))
+    _STATUS_CACHE[url] = (status, time.monotonic())
+
+
 async def _check_url(
     client: httpx.AsyncClient,
     sem: asyncio.Semaphore,
     url: str,
 ) -> int | None:
-    """HEAD-request a URL. Returns status code, or None on error."""
+    """HEAD-request a URL. Returns status code, or None on error.
+
+    Falls back to a one-byte ranged GET when the server rejects HEAD.
+    Any completed response, whatever its status, is cached for an hour;
+    transport errors are not cached.
+    """
+    cached = _cached_status(url)
+    if cached is not None:
+        return cached
     async with sem:
         try:
             resp = await client.head(url, follow_redirects=True)
-            return resp.status_code
+            if resp.status_code in _HEAD_REJECTED_STATUSES:
+                resp = await client.get(
+                    url, headers={"Range": "bytes=0-0"}, follow_redirects=True
+                )
         except Exception:
             return None
+    _cache_status(url, resp.status_code)
+    return resp.status_code
 
 
 async def validate_links(content: str) -> ValidationResult:
@@ -74,12 +137,11 @@ async def validate_links(content: str) -> ValidationResult:
 
     # Check all URLs concurrently
     sem = asyncio.Semaphore(_SEMAPHORE_LIMIT)
-    async with httpx.AsyncClient(timeout=_REQUEST_TIMEOUT) as client:
-        tasks = {
-            url: asyncio.create_task(_check_url(client, sem, url))
-            for url in urls_to_check
-        }
-        results = {url: await task for url, task in tasks.items()}
+    client = _get_client()
+    tasks = {
+        url: asyncio.create_task(_check_url(client, sem, url)) for url in urls_to_check
+    }
+    results = {url: await task for url, task in tasks.items()}
 
     # Identify dead links
     dead_urls: set[str] = set()
@@ -94,15 +156,13 @@ async def validate_links(content: str) -> ValidationResult:
     if not dead_urls:
         return ValidationResult(content=content)
 
-    # Strip dead links from markdown: [text](url) -> text
-    cleaned = content
-    for url in dead_urls:
-        # Replace all markdown links pointing to this dead URL
-        cleaned = re.sub(
-            r"\[([^\]]*)\]\(" + re.escape(url) + r"\)",
-            r"\1",
-            cleaned,
-        )
+    # Strip dead links from markdown in one pass: [text](url) -> text
+    def _replace(m: re.Match) -> str:
+        if m.group(2) in dead_urls:
+            return m.group(1)
+        return m.group(0)
+
+    cleaned = _MD_LINK_RE.sub(_replace, content)
 
     return ValidationResult(content=cleaned, removed=removed)
 
@@ -1,20 +1,48 @@
 import asyncio
 import logging
-from dataclasses import dataclass
+import random
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 
 import anthropic
 import httpx
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types as genai_types
 
+from src.config import settings
+from src.services.llm_cache import cache_key, llm_cache
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
 BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+# Gemini image generation 429s / 503s in bursts mid-batch — retry longer,
+# with full jitter so concurrent image tasks don't retry in lockstep
+GEMINI_MAX_RETRIES = 5
+GEMINI_MAX_DELAY = 30.0
+
+# The genai client is sync and an image call holds a thread for 5-60s, so
+# Gemini gets its own pool instead of starving the loop's default executor.
+# Sized for every concurrent images stage at full fan-out, so calls never
+# queue behind each other and eat into their own timeout.
+_gemini_executor: ThreadPoolExecutor | None = None
+
+
+# Network-level errors (timeout, connection refused, etc.) are always
+# transient. asyncio.TimeoutError is TimeoutError and ConnectionError is an
+# OSError, so one tuple covers them all.
+_NETWORK_ERRORS = (httpx.TimeoutException, httpx.ConnectError, TimeoutError, OSError)
 
 
 def _is_retryable(exc: Exception) -> bool:
     """Return True if the error is transient and worth retrying."""
+    if isinstance(exc, _NETWORK_ERRORS):
+        return True
     # httpx HTTP status errors
     if isinstance(exc, httpx.HTTPStatusError):
         code = exc.response.status_code
@@ -22,11 +50,9 @@ def _is_retryable(exc: Exception) -> bool:
     # Anthropic API errors
     if isinstance(exc, anthropic.APIStatusError):
         return exc.status_code == 429 or exc.status_code >= 500
-    # Network-level errors (timeout, connection refused, etc.)
-    if isinstance(exc, (httpx.TimeoutException, httpx.ConnectError)):
-        return True
-    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError, OSError)):
-        return True
+    # Gemini API errors (content-policy blocks are 4xx and not retried)
+    if isinstance(exc, genai_errors.APIError):
+        return exc.code == 429 or exc.code >= 500
     return False
 
 
@@ -47,8 +73,18 @@ def _retry_after(exc: Exception) -> float | None:
     return None
 
 
-async def _retry(fn, retries: int = MAX_RETRIES, base_delay: float = BASE_DELAY):
-    """Retry an async function with exponential backoff on transient errors only."""
+async def _retry(
+    fn,
+    retries: int = MAX_RETRIES,
+    base_delay: float = BASE_DELAY,
+    max_delay: float = MAX_DELAY,
+):
+    """Retry an async function with exponential backoff on transient errors only.
+
+    Each delay is drawn uniformly from [0, min(max_delay, base_delay * 2**attempt)]
+    (full jitter), so concurrent callers hit by the same 429 or outage don't
+    retry in lockstep. A Retry-After header, when present, is used as-is.
+    """
     for attempt in range(retries):
         try:
             return await fn()
@@ -56,9 +92,10 @@ async def _retry(fn, retries: int = MAX_RETRIES, base_delay: float = BASE_DELAY)
             if attempt == retries - 1 or not _is_retryable(e):
                 raise
             retry_delay = _retry_after(e)
-            delay = (
-                retry_delay if retry_delay is not None else base_delay * (2**attempt)
-            )
+            if retry_delay is not None:
+                delay = retry_delay
+            else:
+                delay = random.uniform(0, min(max_delay, base_delay * (2**attempt)))
             logger.warning(
                 f"Attempt {attempt + 1} failed ({type(e).__name__}): {e}. "
                 f"Retrying in {delay}s..."
@@ -66,15 +103,36 @@ async def _retry(fn, retries: int = MAX_RETRIES, base_delay: float = BASE_DELAY)
             await asyncio.sleep(delay)
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     content: str
     model: str
     tokens_in: int
     tokens_out: int
-
-
-@dataclass
+    # Anthropic prompt-cache usage (input tokens read from / written to cache)
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+async def _cached_chat(
+    key: str | None, call: Callable[[], Awaitable[LLMResponse]]
+) -> LLMResponse:
+    """Serve a chat call from the response cache, or run it and store it.
+
+    `key` is None when caching is disabled for this call.
+    """
+    if key is None:
+        return await _retry(call)
+    hit = await llm_cache.get(key)
+    if hit is not None:
+        logger.info(f"LLM cache hit for {hit['model']}")
+        return LLMResponse(**hit)
+    response = await _retry(call)
+    await llm_cache.set(key, asdict(response), ttl=settings.llm_cache_ttl_s)
+    return response
+
+
+@dataclass(slots=True)
 class ImageGenResponse:
     image_bytes: bytes
     model: str
@@ -95,6 +153,10 @@ class PerplexityClient:
             base_url=self.BASE_URL,
             headers={"Authorization": f"Bearer {self.api_key}"},
             timeout=120.0,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive,
+            ),
         )
 
     async def chat(
@@ -102,7 +164,14 @@ class PerplexityClient:
         prompt: str,
         model: str = "sonar-pro",
         system: str | None = None,
+        use_cache: bool = True,
     ) -> LLMResponse:
+        """Send one chat completion.
+
+        Pass use_cache=False when a fresh answer is wanted even if the same
+        request has been answered before (only relevant when
+        settings.llm_cache_enabled is on).
+        """
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
@@ -123,7 +192,10 @@ class PerplexityClient:
                 tokens_out=usage.get("completion_tokens", 0),
             )
 
-        return await _retry(_call)
+        key = None
+        if use_cache and settings.llm_cache_enabled:
+            key = cache_key(model, system, prompt, provider="perplexity")
+        return await _cached_chat(key, _call)
 
     async def close(self):
         await self._client.aclose()
@@ -141,6 +213,66 @@ class ClaudeClient:
             timeout=httpx.Timeout(300.0),
         )
 
+    @staticmethod
+    def message_params(
+        prompt: str,
+        model: str = "claude-opus-4-6",
+        system: str | None = None,
+        max_tokens: int = 16000,
+        thinking_budget: int = 10000,
+        cache_prefix: str = "",
+    ) -> dict:
+        """Build Messages API params (shared by chat and the batch API).
+
+        When `prompt` starts with `cache_prefix` (a stage's rules), the prefix
+        goes in its own text block marked for Anthropic prompt caching, so
+        later calls with the same system + rules read it from cache.
+        """
+        # Ensure max_tokens > thinking budget (API requirement)
+        effective_max = max(max_tokens, thinking_budget + 1024)
+        content: str | list[dict] = prompt
+        if (
+            settings.claude_prompt_cache
+            and cache_prefix
+            and len(prompt) > len(cache_prefix)
+            and prompt.startswith(cache_prefix)
+        ):
+            content = [
+                {
+                    "type": "text",
+                    "text": cache_prefix,
+                    "cache_control": {"type": "ephemeral"},
+                },
+                {"type": "text", "text": prompt[len(cache_prefix) :]},
+            ]
+        params: dict = {
+            "model": model,
+            "max_tokens": effective_max,
+            "messages": [{"role": "user", "content": content}],
+            "thinking": {
+                "type": "enabled",
+                "budget_tokens": thinking_budget,
+            },
+        }
+        if system:
+            params["system"] = system
+        return params
+
+    @staticmethod
+    def _to_response(message, model: str) -> LLMResponse:
+        """Convert an Anthropic Message into an LLMResponse."""
+        # Extract text content (skip thinking blocks)
+        text_parts = [block.text for block in message.content if block.type == "text"]
+        usage = message.usage
+        return LLMResponse(
+            content="\n".join(text_parts),
+            model=model,
+            tokens_in=usage.input_tokens,
+            tokens_out=usage.output_tokens,
+            cache_read_tokens=usage.cache_read_input_tokens or 0,
+            cache_write_tokens=usage.cache_creation_input_tokens or 0,
+        )
+
     async def chat(
         self,
         prompt: str,
@@ -148,42 +280,200 @@ class ClaudeClient:
         system: str | None = None,
         max_tokens: int = 16000,
         thinking_budget: int = 10000,
+        use_cache: bool = True,
+        cache_prefix: str = "",
     ) -> LLMResponse:
-        async def _call():
-            # Ensure max_tokens > thinking budget (API requirement)
-            effective_max = max(max_tokens, thinking_budget + 1024)
-            kwargs: dict = {
-                "model": model,
-                "max_tokens": effective_max,
-                "messages": [{"role": "user", "content": prompt}],
-                "thinking": {
-                    "type": "enabled",
-                    "budget_tokens": thinking_budget,
-                },
-            }
-            if system:
-                kwargs["system"] = system
-            response = await self._client.messages.create(**kwargs)
-
-            # Extract text content (skip thinking blocks)
-            text_parts = [
-                block.text for block in response.content if block.type == "text"
-            ]
-            content = "\n".join(text_parts)
+        params = self.message_params(
+            prompt, model, system, max_tokens, thinking_budget, cache_prefix
+        )
 
-            return LLMResponse(
-                content=content,
-                model=model,
-                tokens_in=response.usage.input_tokens,
-                tokens_out=response.usage.output_tokens,
+        async def _call():
+            response = await self._client.messages.create(**params)
+            return self._to_response(response, model)
+
+        key = None
+        if use_cache and settings.llm_cache_enabled:
+            key = cache_key(
+                model,
+                system,
+                prompt,
+                provider="anthropic",
+                max_tokens=max_tokens,
+                thinking_budget=thinking_budget,
             )
+        return await _cached_chat(key, _call)
+
+    async def stream(
+        self,
+        prompt: str,
+        on_text: Callable[[str], None],
+        model: str = "claude-opus-4-6",
+        system: str | None = None,
+        max_tokens: int = 16000,
+        thinking_budget: int = 10000,
+        cache_prefix: str = "",
+    ) -> LLMResponse:
+        """Like chat(), but passes each text delta to `on_text` as it arrives.
+
+        Only retried while nothing has been delivered; once `on_text` has seen
+        output, a failure is raised rather than replaying text to the caller.
+        """
+        params = self.message_params(
+            prompt, model, system, max_tokens, thinking_budget, cache_prefix
+        )
+        delivered = False
+
+        async def _call():
+            nonlocal delivered
+            try:
+                async with self._client.messages.stream(**params) as stream:
+                    async for text in stream.text_stream:
+                        delivered = True
+                        on_text(text)
+                    message = await stream.get_final_message()
+            except Exception as e:
+                if delivered:
+                    raise RuntimeError(f"Claude stream interrupted: {e}") from e
+                raise
+            return self._to_response(message, model)
 
         return await _retry(_call)
 
+    async def batch_submit(self, requests: list[tuple[str, dict]]) -> str:
+        """Submit (custom_id, params) pairs to the Message Batches API.
+
+        Returns the batch id.
+        """
+        batch = await _retry(
+            lambda: self._client.messages.batches.create(
+                requests=[
+                    {"custom_id": custom_id, "params": params}
+                    for custom_id, params in requests
+                ]
+            )
+        )
+        return batch.id
+
+    async def batch_poll(
+        self, batch_id: str
+    ) -> dict[str, LLMResponse | Exception] | None:
+        """Return results keyed by custom_id, or None if still processing.
+
+        Requests that errored, expired, or were canceled map to an exception.
+        """
+        batch = await _retry(lambda: self._client.messages.batches.retrieve(batch_id))
+        if batch.processing_status != "ended":
+            return None
+
+        results: dict[str, LLMResponse | Exception] = {}
+        async for entry in await self._client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                message = result.message
+                results[entry.custom_id] = self._to_response(message, message.model)
+            else:
+                results[entry.custom_id] = RuntimeError(
+                    f"Batch request {entry.custom_id} {result.type}"
+                )
+        return results
+
     async def close(self):
         await self._client.close()
 
 
+class ClaudeBatcher:
+    """Coalesce Claude requests into Message Batches API calls.
+
+    Requests submitted within `window_s` of each other (or up to `max_size`)
+    go out as one batch — half the price of real-time calls, at the cost of
+    latency that's fine for background pipelines. Each caller awaits a future
+    resolved when the batch ends.
+    """
+
+    def __init__(
+        self,
+        client: ClaudeClient,
+        window_s: float = 2.0,
+        max_size: int = 16,
+        poll_interval_s: float = 30.0,
+    ):
+        self.client = client
+        self.window_s = window_s
+        self.max_size = max_size
+        self.poll_interval_s = poll_interval_s
+        self._pending: list[tuple[str, dict, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, params: dict) -> LLMResponse:
+        """Queue one Messages API request and wait for its batched result."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((uuid.uuid4().hex, params, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_s, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, dict, asyncio.Future]]) -> None:
+        try:
+            batch_id = await self.client.batch_submit(
+                [(custom_id, params) for custom_id, params, _ in batch]
+            )
+            logger.info(f"Submitted Claude batch {batch_id} ({len(batch)} requests)")
+            while (results := await self.client.batch_poll(batch_id)) is None:
+                await asyncio.sleep(self.poll_interval_s)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for custom_id, _, future in batch:
+            if future.done():
+                continue
+            result = results.get(custom_id)
+            if result is None:
+                result = RuntimeError(f"Batch {batch_id} missing result {custom_id}")
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def _get_gemini_executor() -> ThreadPoolExecutor:
+    """Return the Gemini thread pool, creating it on first use."""
+    global _gemini_executor  # noqa: PLW0603
+    if _gemini_executor is None:
+        _gemini_executor = ThreadPoolExecutor(
+            max_workers=settings.gemini_concurrency * settings.worker_max_jobs,
+            thread_name_prefix="gemini",
+        )
+    return _gemini_executor
+
+
+def shutdown_gemini_executor() -> None:
+    """Stop the Gemini thread pool, dropping calls that haven't started."""
+    global _gemini_executor  # noqa: PLW0603
+    executor, _gemini_executor = _gemini_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 class GeminiClient:
     """Google Gemini API client for image generation."""
 
@@ -210,11 +500,11 @@ class GeminiClient:
                     image_size=image_size,
                 ),
             )
-            # genai client is sync, run in thread with 180s timeout
-            loop = asyncio.get_event_loop()
+            # genai client is sync, run in the Gemini pool with 180s timeout
+            loop = asyncio.get_running_loop()
             response = await asyncio.wait_for(
                 loop.run_in_executor(
-                    None,
+                    _get_gemini_executor(),
                     lambda: self._client.models.generate_content(
                         model=model, contents=prompt, config=config
                     ),
@@ -268,4 +558,6 @@ class GeminiClient:
                 tokens_out=tokens_out,
             )
 
-        return await _retry(_call)
+        return await _retry(
+            _call, retries=GEMINI_MAX_RETRIES, max_delay=GEMINI_MAX_DELAY
+        )
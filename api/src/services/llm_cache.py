@@ -0,0 +1,106 @@
+"""Exact-match response cache for LLM chat calls.
+
+Responses are keyed by a SHA-256 of everything that determines the output
+(model, system prompt, prompt, token limits), with whitespace normalized.
+Lookups hit an in-process LRU first, then Redis when one has been attached
+(the worker attaches ARQ's connection at startup so cached responses
+survive restarts).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "llm_cache:"
+
+
+def _normalize(text: str | None) -> str | None:
+    """Collapse whitespace runs so re-flowed but identical prompts share a key."""
+    if text is None:
+        return None
+    return " ".join(text.split())
+
+
+def cache_key(model: str, system: str | None, prompt: str, **params: Any) -> str:
+    """Hash the inputs of a chat call into a cache key.
+
+    Prompts and system prompts are compared modulo whitespace; anything
+    beyond that (paraphrases, a different topic in the same template) is a
+    different request.
+    """
+    payload = {
+        "model": model,
+        "system": _normalize(system),
+        "prompt": _normalize(prompt),
+        **params,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class LLMCache:
+    """In-process LRU of response dicts, backed by Redis when attached."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lru: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._redis: Any | None = None
+
+    def attach_redis(self, redis: Any | None) -> None:
+        """Use `redis` as the shared tier (None detaches it)."""
+        self._redis = redis
+
+    async def get(self, key: str) -> dict | None:
+        entry = self._lru.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._lru.move_to_end(key)
+                return value
+            del self._lru[key]
+
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(_REDIS_PREFIX + key)
+        except Exception:
+            logger.warning("LLM cache read from Redis failed", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        # Redis keeps its own TTL; hold the local copy for a short while only
+        self._store(key, value, ttl=60.0)
+        return value
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        self._store(key, value, ttl)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                _REDIS_PREFIX + key, json.dumps(value), ex=max(1, int(ttl))
+            )
+        except Exception:
+            logger.warning("LLM cache write to Redis failed", exc_info=True)
+
+    def clear(self) -> None:
+        """Drop the in-process tier (Redis entries expire on their own)."""
+        self._lru.clear()
+
+    def _store(self, key: str, value: dict, ttl: float) -> None:
+        self._lru[key] = (time.monotonic() + ttl, value)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+
+llm_cache = LLMCache(settings.llm_cache_max_entries)
@@ -1,7 +1,10 @@
 """Sitemap discovery, parsing, and crawling service."""
 
+import asyncio
 import gzip
+import html
 import logging
+import re
 from dataclasses import dataclass
 from io import BytesIO
 from urllib.parse import urlparse
@@ -9,16 +12,32 @@ from urllib.parse import urlparse
 import httpx
 from lxml import etree
 
+from src.config import settings
+
 logger = logging.getLogger(__name__)
 
 SITEMAP_NS = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+# Clark-notation tag names, compared directly against element.tag
+_SM_URL = f"{{{SITEMAP_NS['sm']}}}url"
+_SM_SITEMAP = f"{{{SITEMAP_NS['sm']}}}sitemap"
+_SM_LOC = f"{{{SITEMAP_NS['sm']}}}loc"
+_SM_LASTMOD = f"{{{SITEMAP_NS['sm']}}}lastmod"
 SITEMAP_TIMEOUT = 30.0
 TITLE_FETCH_TIMEOUT = 10.0
+TITLE_FETCH_CONCURRENCY = 16
+TITLE_FETCH_MAX_BYTES = 32 * 1024
+SITEMAP_FETCH_CONCURRENCY = 8
 MAX_URLS_PER_SITEMAP = 50000
 USER_AGENT = "ContentPipelineBot/1.0"
+_GZIP_MAGIC = b"\x1f\x8b"
+_TITLE_RE = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+_TITLE_END_RE = re.compile(rb"</title", re.IGNORECASE)
+
+# Pooled client reused across crawls (keep-alive connections, one pool)
+_client: httpx.AsyncClient | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SitemapEntry:
     url: str
     title: str | None = None
@@ -37,44 +56,50 @@ def parse_sitemap_xml(content: bytes) -> tuple[list[str], list[SitemapEntry]]:
       - sub_sitemap_urls: list of nested sitemap URLs (from <sitemapindex>)
       - entries: list of SitemapEntry (from <urlset>)
     """
-    # Try to decompress gzip
-    try:
-        content = gzip.decompress(content)
-    except (gzip.BadGzipFile, OSError):
-        pass  # Not gzipped, use raw content
+    # .xml.gz sitemaps are decompressed as the parser reads, not up front
+    source = BytesIO(content)
+    if content[:2] == _GZIP_MAGIC:
+        source = gzip.GzipFile(fileobj=source)
+
+    sub_sitemaps: list[str] = []
+    entries: list[SitemapEntry] = []
 
+    # Stream <url>/<sitemap> elements and discard each once read, so a 50k-URL
+    # sitemap never exists as a full tree in memory
     try:
-        tree = etree.parse(BytesIO(content))
+        context = etree.iterparse(source, events=("end",), tag=(_SM_URL, _SM_SITEMAP))
+        for _, el in context:
+            loc = lastmod = None
+            for child in el:
+                if child.tag == _SM_LOC:
+                    loc = child.text
+                elif child.tag == _SM_LASTMOD:
+                    lastmod = child.text
+            if loc:
+                if el.tag == _SM_URL:
+                    entries.append(
+                        SitemapEntry(
+                            url=loc.strip(),
+                            lastmod=lastmod.strip() if lastmod else None,
+                        )
+                    )
+                else:
+                    sub_sitemaps.append(loc.strip())
+            el.clear(keep_tail=True)
+            while el.getprevious() is not None:
+                del el.getparent()[0]
+        root = context.root
     except etree.XMLSyntaxError as e:
         raise SitemapParseError(f"Malformed XML: {e}") from e
+    except (OSError, EOFError) as e:
+        raise SitemapParseError(f"Corrupt gzip data: {e}") from e
 
-    root = tree.getroot()
     tag = etree.QName(root.tag).localname if root.tag else ""
-
-    sub_sitemaps: list[str] = []
-    entries: list[SitemapEntry] = []
-
     if tag == "sitemapindex":
-        for sitemap_el in root.findall("sm:sitemap", SITEMAP_NS):
-            loc = sitemap_el.findtext("sm:loc", namespaces=SITEMAP_NS)
-            if loc:
-                sub_sitemaps.append(loc.strip())
-    elif tag == "urlset":
-        for url_el in root.findall("sm:url", SITEMAP_NS):
-            loc = url_el.findtext("sm:loc", namespaces=SITEMAP_NS)
-            if not loc:
-                continue
-            lastmod = url_el.findtext("sm:lastmod", namespaces=SITEMAP_NS)
-            entries.append(
-                SitemapEntry(
-                    url=loc.strip(),
-                    lastmod=lastmod.strip() if lastmod else None,
-                )
-            )
-    else:
-        raise SitemapParseError(f"Unknown root element: {tag}")
-
-    return sub_sitemaps, entries
+        return sub_sitemaps, []
+    if tag == "urlset":
+        return [], entries
+    raise SitemapParseError(f"Unknown root element: {tag}")
 
 
 def parse_robots_txt(content: str, base_url: str) -> list[str]:
@@ -89,6 +114,30 @@ def parse_robots_txt(content: str, base_url: str) -> list[str]:
     return sitemaps
 
 
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared crawl client, creating it on first use."""
+    global _client  # noqa: PLW0603
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=SITEMAP_TIMEOUT,
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive,
+            ),
+        )
+    return _client
+
+
+async def close_sitemap_client() -> None:
+    """Close the shared crawl client (called on worker shutdown)."""
+    global _client  # noqa: PLW0603
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
 async def discover_sitemaps(
     website_url: str, client: httpx.AsyncClient | None = None
 ) -> list[str]:
@@ -100,57 +149,77 @@ async def discover_sitemaps(
     """
     parsed = urlparse(website_url)
     base = f"{parsed.scheme}://{parsed.netloc}"
-    own_client = client is None
-    if own_client:
-        client = httpx.AsyncClient(
-            timeout=SITEMAP_TIMEOUT,
-            headers={"User-Agent": USER_AGENT},
-            follow_redirects=True,
-        )
+    if client is None:
+        client = _get_client()
 
+    # Try robots.txt
     try:
-        # Try robots.txt
+        resp = await client.get(f"{base}/robots.txt")
+        if resp.status_code == 200:
+            sitemaps = parse_robots_txt(resp.text, base)
+            if sitemaps:
+                return sitemaps
+    except httpx.HTTPError:
+        pass
+
+    # Fallback: try common sitemap paths
+    for path in ["/sitemap.xml", "/sitemap_index.xml"]:
         try:
-            resp = await client.get(f"{base}/robots.txt")
+            resp = await client.get(f"{base}{path}")
             if resp.status_code == 200:
-                sitemaps = parse_robots_txt(resp.text, base)
-                if sitemaps:
-                    return sitemaps
+                return [f"{base}{path}"]
         except httpx.HTTPError:
-            pass
+            continue
 
-        # Fallback: try common sitemap paths
-        for path in ["/sitemap.xml", "/sitemap_index.xml"]:
-            try:
-                resp = await client.get(f"{base}{path}")
-                if resp.status_code == 200:
-                    return [f"{base}{path}"]
-            except httpx.HTTPError:
-                continue
-
-        return []
-    finally:
-        if own_client:
-            await client.aclose()
+    return []
 
 
 async def fetch_and_parse_sitemap(
-    url: str, client: httpx.AsyncClient, max_depth: int = 3
+    url: str,
+    client: httpx.AsyncClient,
+    max_depth: int = 3,
+    visited: set[str] | None = None,
 ) -> list[SitemapEntry]:
     """Fetch a sitemap URL and recursively resolve any sitemap indexes.
 
-    Returns a flat list of all SitemapEntry objects found.
+    Each sitemap URL is fetched at most once; pass the same `visited` set
+    to share that across several calls. Returns a flat list of all
+    SitemapEntry objects found.
+    """
+    if visited is None:
+        visited = set()
+    url_key = url.rstrip("/")
+    if url_key in visited:
+        return []
+    visited.add(url_key)
+
+    sem = asyncio.Semaphore(SITEMAP_FETCH_CONCURRENCY)
+    return await _fetch_sitemap_tree(url, client, max_depth, sem, visited)
+
+
+async def _fetch_sitemap_tree(
+    url: str,
+    client: httpx.AsyncClient,
+    max_depth: int,
+    sem: asyncio.Semaphore,
+    visited: set[str],
+) -> list[SitemapEntry]:
+    """fetch_and_parse_sitemap body; `sem` bounds fetches across the whole tree.
+
+    `url` must already be in `visited`.
     """
     if max_depth <= 0:
         logger.warning(f"Max sitemap depth reached for {url}")
         return []
 
-    try:
-        resp = await client.get(url)
-        resp.raise_for_status()
-    except httpx.HTTPError as e:
-        logger.error(f"Failed to fetch sitemap {url}: {e}")
-        return []
+    # Held for the fetch only, so recursing into children can't deadlock
+    async with sem:
+        try:
+            resp = await client.get(url)
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch sitemap {url}: {e}")
+            return []
 
     try:
         sub_sitemaps, entries = parse_sitemap_xml(resp.content)
@@ -158,31 +227,52 @@ async def fetch_and_parse_sitemap(
         logger.error(f"Failed to parse sitemap {url}: {e}")
         return []
 
-    # Recursively fetch sub-sitemaps
+    # Claim children before gathering so indexes that list each other (or
+    # share sub-sitemaps) don't fetch the same URL on every path
+    new_subs = []
     for sub_url in sub_sitemaps:
-        sub_entries = await fetch_and_parse_sitemap(sub_url, client, max_depth - 1)
+        sub_key = sub_url.rstrip("/")
+        if sub_key not in visited:
+            visited.add(sub_key)
+            new_subs.append(sub_url)
+
+    # Fetch sub-sitemaps concurrently; gather keeps their order
+    sub_results = await asyncio.gather(
+        *(
+            _fetch_sitemap_tree(sub_url, client, max_depth - 1, sem, visited)
+            for sub_url in new_subs
+        )
+    )
+    for sub_entries in sub_results:
         entries.extend(sub_entries)
 
     return entries
 
 
 async def fetch_page_title(url: str, client: httpx.AsyncClient) -> str | None:
-    """Fetch a page and extract its <title> tag."""
+    """Fetch a page and extract its <title> tag.
+
+    Only the start of the body is downloaded: reading stops once </title> has
+    arrived or TITLE_FETCH_MAX_BYTES have been read.
+    """
     try:
-        resp = await client.get(url, timeout=TITLE_FETCH_TIMEOUT)
-        resp.raise_for_status()
+        async with client.stream("GET", url, timeout=TITLE_FETCH_TIMEOUT) as resp:
+            resp.raise_for_status()
+            content_type = resp.headers.get("content-type", "")
+            if "html" not in content_type:
+                return None
+
+            head = bytearray()
+            async for chunk in resp.aiter_bytes():
+                head += chunk
+                if len(head) >= TITLE_FETCH_MAX_BYTES or _TITLE_END_RE.search(head):
+                    break
+            text = head[:TITLE_FETCH_MAX_BYTES].decode(resp.encoding, errors="replace")
     except httpx.HTTPError:
         return None
 
-    content_type = resp.headers.get("content-type", "")
-    if "html" not in content_type:
-        return None
-
-    from bs4 import BeautifulSoup
-
-    soup = BeautifulSoup(resp.text[:50000], "html.parser")
-    title_tag = soup.find("title")
-    return title_tag.get_text(strip=True) if title_tag else None
+    match = _TITLE_RE.search(text)
+    return html.unescape(match.group(1)).strip() if match else None
 
 
 async def crawl_sitemap(
@@ -194,32 +284,30 @@ async def crawl_sitemap(
 
     Returns list of SitemapEntry with url, title, and lastmod.
     """
-    own_client = client is None
-    if own_client:
-        client = httpx.AsyncClient(
-            timeout=SITEMAP_TIMEOUT,
-            headers={"User-Agent": USER_AGENT},
-            follow_redirects=True,
-        )
+    if client is None:
+        client = _get_client()
 
-    try:
-        sitemap_urls = await discover_sitemaps(website_url, client)
-        if not sitemap_urls:
-            logger.warning(f"No sitemaps found for {website_url}")
-            return []
+    sitemap_urls = await discover_sitemaps(website_url, client)
+    if not sitemap_urls:
+        logger.warning(f"No sitemaps found for {website_url}")
+        return []
+
+    all_entries: list[SitemapEntry] = []
+    visited: set[str] = set()
+    for sitemap_url in sitemap_urls:
+        entries = await fetch_and_parse_sitemap(sitemap_url, client, visited=visited)
+        all_entries.extend(entries)
+
+    # Optionally fetch page titles, a bounded number at a time
+    if fetch_titles:
+        sem = asyncio.Semaphore(TITLE_FETCH_CONCURRENCY)
+
+        async def _fetch_title(entry: SitemapEntry) -> None:
+            async with sem:
+                entry.title = await fetch_page_title(entry.url, client)
+
+        await asyncio.gather(
+            *(_fetch_title(entry) for entry in all_entries if not entry.title)
+        )
 
-        all_entries: list[SitemapEntry] = []
-        for sitemap_url in sitemap_urls:
-            entries = await fetch_and_parse_sitemap(sitemap_url, client)
-            all_entries.extend(entries)
-
-        # Optionally fetch page titles (rate-limited by httpx connection pool)
-        if fetch_titles:
-            for entry in all_entries:
-                if not entry.title:
-                    entry.title = await fetch_page_title(entry.url, client)
-
-        return all_entries
-    finally:
-        if own_client:
-            await client.aclose()
+    return all_entries
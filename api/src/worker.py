@@ -1,15 +1,24 @@
 """ARQ worker entry point for pipeline job processing."""
 
+import asyncio
 import json
 import logging
+import re
 import uuid
-from datetime import UTC, datetime
-from urllib.parse import urlparse
+from datetime import UTC, datetime, timedelta
+from urllib.parse import urlsplit
 
 from arq.connections import RedisSettings
 from arq.cron import cron
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import and_, case, func, or_, select, text, update
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import defer
 
 from src.api.events import publish_event
 from src.config import settings
@@ -19,6 +28,10 @@ from src.models.profile import WebsiteProfile
 from src.pipeline.helpers import (
     append_execution_log,
     clear_event_context,
+    close_llm_clients,
+    compute_cost,
+    flush_stage_logs,
+    load_rules,
     log_stage_execution,
     save_stage_output,
     set_event_context,
@@ -32,8 +45,11 @@ from src.pipeline.stages.ready import ready_node
 from src.pipeline.stages.research import research_node
 from src.pipeline.stages.write import write_node
 from src.pipeline.state import STAGE_OUTPUT_KEY, STAGES, state_from_post
+from src.services.analytics import compute_analytics
 from src.services.api_keys import get_api_keys
-from src.services.sitemap import crawl_sitemap
+from src.services.link_validator import close_link_client
+from src.services.llm_cache import llm_cache
+from src.services.sitemap import SitemapEntry, close_sitemap_client, crawl_sitemap
 
 STAGE_NODE_FN = {
     "research": research_node,
@@ -44,11 +60,50 @@ STAGE_NODE_FN = {
     "ready": ready_node,
 }
 
+# The pipeline never reads the (ever-growing) log columns; leave them in
+# Postgres when loading a post for a stage
+_SKIP_POST_LOGS = [defer(Post.execution_logs), defer(Post.stage_logs)]
+
+# Last path segment of an absolute URL, ignoring trailing slashes, query and
+# fragment; one C-level scan instead of urlparse + strip + split per entry
+_URL_SLUG_RE = re.compile(
+    r"[a-z][a-z0-9+.-]*://[^/?#]*(?:/(?:[^?#]*/)?([^/?#]+))?/*(?:[?#]|$)",
+    re.IGNORECASE,
+)
+
+# Bulk upsert of crawled links; ids are generated here because the model's
+# uuid4 default only applies to ORM inserts
+_UPSERT_SITEMAP_LINKS = text(
+    "INSERT INTO internal_links (id, profile_id, url, title, slug, source) "
+    "SELECT gen_random_uuid(), CAST(:profile_id AS uuid), u.url, u.title, "
+    "u.slug, 'sitemap' FROM UNNEST(CAST(:urls AS text[]), "
+    "CAST(:titles AS text[]), CAST(:slugs AS text[])) AS u(url, title, slug) "
+    "ON CONFLICT (profile_id, url) DO UPDATE SET "
+    "title = COALESCE(EXCLUDED.title, internal_links.title), "
+    "slug = COALESCE(EXCLUDED.slug, internal_links.slug)"
+)
+
+# Flip one key of stage_status inside Postgres instead of rewriting the blob
+_MARK_STAGE_RUNNING = text(
+    "UPDATE posts SET stage_status = jsonb_set("
+    "COALESCE(stage_status, CAST('{}' AS jsonb)), "
+    "ARRAY[CAST(:stage AS text)], CAST('\"running\"' AS jsonb), true), "
+    "current_stage = :stage, updated_at = now() "
+    "WHERE id = :post_id"
+)
+
+# stage_status once a post is finished, for JSONB containment (@>) checks
+_ALL_STAGES_COMPLETE = {s: "complete" for s in STAGES}
+
 logger = logging.getLogger(__name__)
 
 DLQ_KEY = "arq:dead_letter_queue"
+# Newest entries kept in the DLQ list; older ones are trimmed on push
+DLQ_MAX_ENTRIES = 1000
 WORKER_LAST_COMPLETED_KEY = "arq:worker:last_completed"
 MAX_ATTEMPTS = 3
+# Days since the last crawl after which a profile is re-crawled
+RECRAWL_INTERVAL_DAYS = {"weekly": 7, "biweekly": 14, "monthly": 30}
 
 
 async def run_pipeline_stage(ctx, post_id: str, stage: str | None = None):
@@ -63,13 +118,6 @@ async def run_pipeline_stage(ctx, post_id: str, stage: str | None = None):
     session_factory: async_sessionmaker = ctx["session_factory"]
     redis = ctx["redis"]
 
-    # Verify post exists
-    async with session_factory() as session:
-        post = await session.get(Post, uuid.UUID(post_id))
-        if not post:
-            logger.error(f"Post {post_id} not found")
-            return
-
     if stage:
         # Single-stage: run just this stage
         await _run_pipeline(
@@ -111,12 +159,19 @@ async def _run_pipeline(
     4. Logs metrics and publishes SSE events
     """
     is_full_pipeline = stages is None
+    post_uuid = uuid.UUID(post_id)
     target_stages = stages if stages is not None else STAGES
 
     try:
-        if is_full_pipeline:
-            # Log pipeline_start to DB
-            async with session_factory() as session:
+        # One session (one pooled connection at a time) serves the whole job
+        async with session_factory() as session:
+            found = await session.scalar(select(Post.id).where(Post.id == post_uuid))
+            if found is None:
+                logger.error(f"Post {post_id} not found")
+                return
+
+            if is_full_pipeline:
+                # Log pipeline_start to DB
                 await append_execution_log(
                     session,
                     post_id,
@@ -126,24 +181,24 @@ async def _run_pipeline(
                     "Full pipeline run initiated",
                 )
 
-        # Load API keys from DB (with env var fallback)
-        async with session_factory() as session:
+            # Load API keys from DB (with env var fallback)
             api_keys = await get_api_keys(session)
 
-        # Fetch internal links once (needed by edit stage prompt)
-        internal_links = await _fetch_internal_links_from_factory(
-            session_factory, post_id
-        )
-
-        for stage in target_stages:
-            node_fn = STAGE_NODE_FN.get(stage)
-            if not node_fn:
-                logger.error(f"No node function for stage '{stage}'")
-                continue
-
-            # Load fresh post from DB each iteration
-            async with session_factory() as session:
-                post = await session.get(Post, uuid.UUID(post_id))
+            # Fetch internal links once (needed by edit stage prompt)
+            internal_links = await _fetch_internal_links(session, post_uuid)
+            # Nothing is read between here and the first stage's commit, so
+            # the connection goes back to the pool before any LLM call
+
+            for stage in target_stages:
+                node_fn = STAGE_NODE_FN.get(stage)
+                if not node_fn:
+                    logger.error(f"No node function for stage '{stage}'")
+                    continue
+
+                # Load fresh post from DB each iteration (the session outlives
+                # the stage, so drop what the previous one left in it)
+                session.expire_all()
+                post = await session.get(Post, post_uuid, options=_SKIP_POST_LOGS)
                 if not post:
                     logger.error(f"Post {post_id} not found during pipeline")
                     return
@@ -158,15 +213,11 @@ async def _run_pipeline(
                 initial_state = state_from_post(post, internal_links)
                 initial_state["api_keys"] = api_keys
 
-            # Persist "running" to DB before SSE so fetchPost reads correct state
-            async with session_factory() as session:
-                post_obj = await session.get(Post, uuid.UUID(post_id))
-                if post_obj:
-                    ss = dict(post_obj.stage_status or {})
-                    ss[stage] = "running"
-                    post_obj.stage_status = ss
-                    post_obj.current_stage = stage
-                    await session.commit()
+                # Persist "running" to DB before SSE so fetchPost reads correct state
+                # (status and stage_start log go out in one commit)
+                await session.execute(
+                    _MARK_STAGE_RUNNING, {"stage": stage, "post_id": post_id}
+                )
                 await append_execution_log(
                     session,
                     post_id,
@@ -174,23 +225,29 @@ async def _run_pipeline(
                     "info",
                     "stage_start",
                     f"Starting {stage}...",
+                    commit=False,
                 )
+                await session.commit()
 
-            # SSE after DB is committed
-            await publish_event(
-                redis,
-                post_id,
-                "stage_start",
-                {"stage": stage, "message": f"Starting {stage}..."},
-            )
-            set_event_context(redis, post_id, session_factory)
-
-            result = await node_fn(initial_state)
+                # SSE after DB is committed
+                async with redis.pipeline(transaction=False) as pipe:
+                    await publish_event(
+                        redis,
+                        post_id,
+                        "stage_start",
+                        {"stage": stage, "message": f"Starting {stage}..."},
+                        pipe=pipe,
+                    )
+                    await pipe.execute()
+                event_token = set_event_context(redis, post_id, session_factory)
 
-            clear_event_context()
+                try:
+                    result = await node_fn(initial_state)
+                finally:
+                    await flush_stage_logs()
+                    clear_event_context(event_token)
 
-            # Save output and log metrics immediately
-            async with session_factory() as session:
+                # Save output and log metrics immediately, in a single transaction
                 meta = result.get("_stage_meta")
                 if isinstance(meta, dict):
                     await log_stage_execution(
@@ -201,6 +258,7 @@ async def _run_pipeline(
                         meta["tokens_in"],
                         meta["tokens_out"],
                         meta["duration_s"],
+                        commit=False,
                     )
 
                 # Log additional model calls (e.g. Gemini image gen)
@@ -218,6 +276,7 @@ async def _run_pipeline(
                         gemini_meta["tokens_in"],
                         gemini_meta["tokens_out"],
                         gemini_meta["duration_s"],
+                        commit=False,
                     )
 
                 content = result.get(STAGE_OUTPUT_KEY.get(stage, ""))
@@ -229,16 +288,26 @@ async def _run_pipeline(
                         stage,
                         content,
                         stage_status=stage_status,
+                        commit=False,
                     )
 
-                # Single-stage rerun: check if all stages are now complete
+                # Single-stage rerun: mark the post complete if every stage
+                # now is, decided in the UPDATE itself (no read back)
                 if not is_full_pipeline:
-                    post = await session.get(Post, uuid.UUID(post_id))
-                    if post:
-                        ss = post.stage_status or {}
-                        if all(ss.get(s) == "complete" for s in STAGES):
-                            post.current_stage = "complete"
-                        await session.commit()
+                    await session.execute(
+                        update(Post)
+                        .where(Post.id == post_uuid)
+                        .values(
+                            current_stage=case(
+                                (
+                                    Post.stage_status.contains(_ALL_STAGES_COMPLETE),
+                                    "complete",
+                                ),
+                                else_=Post.current_stage,
+                            )
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
 
                 # Log stage_complete to DB
                 await append_execution_log(
@@ -253,38 +322,43 @@ async def _run_pipeline(
                         "tokens_in": meta["tokens_in"],
                         "tokens_out": meta["tokens_out"],
                         "duration_s": round(meta["duration_s"], 2),
-                        "cost_usd": round(
-                            (meta["tokens_in"] / 1_000_000 * 15.0)
-                            + (meta["tokens_out"] / 1_000_000 * 75.0),
-                            6,
+                        "cost_usd": compute_cost(
+                            meta["model"], meta["tokens_in"], meta["tokens_out"]
                         ),
                     }
                     if meta
                     else {},
+                    commit=False,
                 )
+                await session.commit()
 
-            await publish_event(
-                redis,
-                post_id,
-                "stage_complete",
-                {
-                    "stage": stage,
-                    "model": meta["model"] if meta else "",
-                    "duration_s": round(meta["duration_s"], 2) if meta else 0,
-                },
-            )
-
-        # Full pipeline completion
-        if is_full_pipeline:
-            should_publish_wp = False
-            should_publish_nextjs = False
-            async with session_factory() as session:
-                post = await session.get(Post, uuid.UUID(post_id))
+                async with redis.pipeline(transaction=False) as pipe:
+                    await publish_event(
+                        redis,
+                        post_id,
+                        "stage_complete",
+                        {
+                            "stage": stage,
+                            "model": meta["model"] if meta else "",
+                            "duration_s": (
+                                round(meta["duration_s"], 2) if meta else 0
+                            ),
+                        },
+                        pipe=pipe,
+                    )
+                    await pipe.execute()
+
+            # Full pipeline completion
+            if is_full_pipeline:
+                should_publish_wp = False
+                should_publish_nextjs = False
+                session.expire_all()
+                post = await session.get(Post, post_uuid, options=_SKIP_POST_LOGS)
                 if post:
                     state = state_from_post(post, internal_links)
                     await _post_completion_hook(session, post_id, state)
-                    # Check if WP or Next.js publish was queued
-                    await session.refresh(post)
+                    # Check if WP or Next.js publish was queued (the hook set
+                    # them on this same identity-mapped post)
                     should_publish_wp = post.wp_publish_status == "pending"
                     should_publish_nextjs = post.nextjs_publish_status == "pending"
 
@@ -297,20 +371,24 @@ async def _run_pipeline(
                     "Pipeline finished",
                 )
 
-            await publish_event(
-                redis,
-                post_id,
-                "pipeline_complete",
-                {"message": "Pipeline finished"},
-            )
-
-            if should_publish_wp:
-                await redis.enqueue_job("publish_to_wordpress", post_id)
+                if should_publish_wp:
+                    await redis.enqueue_job("publish_to_wordpress", post_id)
 
-            if should_publish_nextjs:
-                await redis.enqueue_job("publish_to_nextjs", post_id)
+                if should_publish_nextjs:
+                    await redis.enqueue_job("publish_to_nextjs", post_id)
 
-        await _record_job_completed(redis)
+            # Completion event and last-completed marker in one round trip
+            async with redis.pipeline(transaction=False) as pipe:
+                if is_full_pipeline:
+                    await publish_event(
+                        redis,
+                        post_id,
+                        "pipeline_complete",
+                        {"message": "Pipeline finished"},
+                        pipe=pipe,
+                    )
+                _record_job_completed(pipe)
+                await pipe.execute()
 
     except Exception as e:
         clear_event_context()
@@ -364,26 +442,20 @@ async def _run_pipeline(
         raise
 
 
-async def _fetch_internal_links(session: AsyncSession, post: Post) -> list[dict]:
-    """Fetch internal links for a post's profile."""
-    if not post.profile_id:
-        return []
+async def _fetch_internal_links(
+    session: AsyncSession, post_id: uuid.UUID
+) -> list[dict]:
+    """Fetch the internal links of a post's profile (just the columns prompts use).
+
+    Joins through the post so the profile lookup isn't its own round trip;
+    posts without a profile get no rows.
+    """
     result = await session.execute(
-        select(InternalLink).where(InternalLink.profile_id == post.profile_id)
+        select(InternalLink.url, InternalLink.title, InternalLink.slug)
+        .join(Post, Post.profile_id == InternalLink.profile_id)
+        .where(Post.id == post_id)
     )
-    links = result.scalars().all()
-    return [{"url": link.url, "title": link.title, "slug": link.slug} for link in links]
-
-
-async def _fetch_internal_links_from_factory(
-    session_factory, post_id: str
-) -> list[dict]:
-    """Fetch internal links using a session factory (for the sequential pipeline)."""
-    async with session_factory() as session:
-        post = await session.get(Post, uuid.UUID(post_id))
-        if not post:
-            return []
-        return await _fetch_internal_links(session, post)
+    return [{"url": url, "title": title, "slug": slug} for url, title, slug in result]
 
 
 async def _move_to_dlq(
@@ -393,30 +465,35 @@ async def _move_to_dlq(
     session_factory: async_sessionmaker = ctx["session_factory"]
     redis = ctx["redis"]
 
+    # One timestamp for the DLQ entry and the post, so the two agree
+    failed_at = datetime.now(UTC).isoformat()
     dlq_entry = json.dumps(
         {
             "post_id": post_id,
             "stage": stage,
             "error": error,
             "attempts": attempts,
-            "failed_at": datetime.now(UTC).isoformat(),
+            "failed_at": failed_at,
         }
     )
-    await redis.lpush(DLQ_KEY, dlq_entry)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.lpush(DLQ_KEY, dlq_entry)
+        pipe.ltrim(DLQ_KEY, 0, DLQ_MAX_ENTRIES - 1)
+        await pipe.execute()
 
+    # Store error info in stage_logs, patched server-side like stage metrics
+    error_info = {"message": error, "attempts": attempts, "failed_at": failed_at}
     async with session_factory() as session:
-        post = await session.get(Post, uuid.UUID(post_id))
-        if post:
-            post.current_stage = "failed"
-            # Store error info in stage_logs
-            logs = dict(post.stage_logs or {})
-            logs["_error"] = {
-                "message": error,
-                "attempts": attempts,
-                "failed_at": datetime.now(UTC).isoformat(),
-            }
-            post.stage_logs = logs
-            await session.commit()
+        await session.execute(
+            text(
+                "UPDATE posts SET current_stage = 'failed', "
+                "stage_logs = jsonb_set(COALESCE(stage_logs, CAST('{}' AS jsonb)), "
+                "'{_error}', CAST(:error AS jsonb), true), updated_at = now() "
+                "WHERE id = :post_id"
+            ),
+            {"error": json.dumps(error_info), "post_id": post_id},
+        )
+        await session.commit()
 
     logger.error(
         f"Post {post_id} moved to dead letter queue after {attempts} failures: {error}"
@@ -426,16 +503,16 @@ async def _move_to_dlq(
 async def _post_completion_hook(
     session: AsyncSession, post_id: str, state: dict
 ) -> None:
-    """After pipeline completes, mark the post as complete and optionally publish."""
+    """After pipeline completes, mark the post as complete and optionally publish.
+
+    The completion and any publish flags are committed together, once.
+    """
     post = await session.get(Post, uuid.UUID(post_id))
     if not post:
         return
 
     post.current_stage = "complete"
     post.completed_at = datetime.now(UTC)
-    await session.commit()
-
-    logger.info(f"Post {post_id} completed")
 
     # Auto-publish to WordPress if configured
     if post.output_format == "wordpress" and post.profile_id:
@@ -447,10 +524,8 @@ async def _post_completion_hook(
             and profile.wp_app_password
         )
         if wp_configured:
-            post.wp_publish_status = "pending"
-            await session.commit()
-            # Import redis from the session's bind context — we pass it via caller
             # The caller (_run_pipeline) will enqueue the job after this returns
+            post.wp_publish_status = "pending"
 
     # Auto-publish to Next.js if configured
     if post.output_format == "nextjs" and post.profile_id:
@@ -462,80 +537,102 @@ async def _post_completion_hook(
         )
         if nextjs_configured:
             post.nextjs_publish_status = "pending"
-            await session.commit()
+
+    await session.commit()
+    logger.info(f"Post {post_id} completed")
 
 
-async def _record_job_completed(redis) -> None:
-    """Record the timestamp of the last completed job in Redis."""
-    await redis.set(WORKER_LAST_COMPLETED_KEY, datetime.now(UTC).isoformat())
+def _record_job_completed(pipe) -> None:
+    """Queue the last-completed-job timestamp SET on a Redis pipeline."""
+    pipe.set(WORKER_LAST_COMPLETED_KEY, datetime.now(UTC).isoformat())
+
+
+def _slug_from_url(url: str) -> str | None:
+    """Last non-empty segment of a URL's path (None for the site root)."""
+    match = _URL_SLUG_RE.match(url)
+    if match:
+        return match.group(1)
+    # Not an absolute http(s)-style URL; fall back to a full parse
+    path = urlsplit(url).path.strip("/")
+    return path.rpartition("/")[2] if path else None
+
+
+async def _upsert_sitemap_links(
+    session: AsyncSession, profile_id: uuid.UUID, entries: list[SitemapEntry]
+) -> None:
+    """Insert crawled entries into internal_links, updating rows that exist.
+
+    A single INSERT ... SELECT FROM UNNEST ... ON CONFLICT ships the crawl as
+    three arrays, so the statement text (and asyncpg's prepared statement) is
+    the same however many URLs there are. Existing titles and slugs are only
+    overwritten with non-empty values.
+    """
+    # ON CONFLICT can't touch the same row twice in one statement, so merge
+    # URLs listed more than once (across sub-sitemaps) first
+    rows: dict[str, tuple[str | None, str | None]] = {}
+    for entry in entries:
+        slug = _slug_from_url(entry.url)
+        title, prev_slug = rows.get(entry.url, (None, None))
+        rows[entry.url] = (entry.title or title, slug or prev_slug)
+    if not rows:
+        return
+
+    await session.execute(
+        _UPSERT_SITEMAP_LINKS,
+        {
+            "profile_id": profile_id,
+            "urls": list(rows),
+            "titles": [title for title, _ in rows.values()],
+            "slugs": [slug for _, slug in rows.values()],
+        },
+    )
 
 
 async def crawl_profile_sitemap(ctx, profile_id: str):
     """Crawl a website profile's sitemap and populate internal links."""
     session_factory: async_sessionmaker = ctx["session_factory"]
+    profile_uuid = uuid.UUID(profile_id)
 
     async with session_factory() as session:
-        profile = await session.get(WebsiteProfile, uuid.UUID(profile_id))
-        if not profile:
+        # Flag the crawl for the UI and read what it needs in one round trip
+        row = (
+            await session.execute(
+                update(WebsiteProfile)
+                .where(WebsiteProfile.id == profile_uuid)
+                .values(crawl_status="crawling")
+                .returning(WebsiteProfile.name, WebsiteProfile.website_url)
+            )
+        ).first()
+        if row is None:
             logger.error(f"Profile {profile_id} not found")
             return
-
-        profile.crawl_status = "crawling"
         await session.commit()
+        name, website_url = row
 
         try:
-            entries = await crawl_sitemap(profile.website_url, fetch_titles=False)
+            entries = await crawl_sitemap(website_url, fetch_titles=False)
             logger.info(
-                f"Crawled {len(entries)} URLs for "
-                f"profile {profile.name} ({profile.website_url})"
+                f"Crawled {len(entries)} URLs for profile {name} ({website_url})"
             )
 
-            # Store discovered sitemap URLs on the profile
-            sitemap_urls_seen: list[str] = []
-
-            # Upsert entries into internal_links
-            for entry in entries:
-                # Extract slug from URL path
-                parsed = urlparse(entry.url)
-                path = parsed.path.strip("/")
-                slug = path.split("/")[-1] if path else None
-
-                existing = await session.execute(
-                    select(InternalLink).where(
-                        InternalLink.profile_id == profile.id,
-                        InternalLink.url == entry.url,
-                    )
-                )
-                link = existing.scalar_one_or_none()
-
-                if link:
-                    # Update existing
-                    if entry.title:
-                        link.title = entry.title
-                    if slug:
-                        link.slug = slug
-                else:
-                    # Create new
-                    link = InternalLink(
-                        profile_id=profile.id,
-                        url=entry.url,
-                        title=entry.title,
-                        slug=slug,
-                        source="sitemap",
-                    )
-                    session.add(link)
-
-            profile.crawl_status = "complete"
-            profile.last_crawled_at = datetime.now(UTC)
-            if sitemap_urls_seen:
-                profile.sitemap_urls = sitemap_urls_seen
+            await _upsert_sitemap_links(session, profile_uuid, entries)
+            await session.execute(
+                update(WebsiteProfile)
+                .where(WebsiteProfile.id == profile_uuid)
+                .values(crawl_status="complete", last_crawled_at=func.now())
+            )
             await session.commit()
 
-            logger.info(f"Sitemap crawl complete for profile {profile.name}")
+            logger.info(f"Sitemap crawl complete for profile {name}")
 
         except Exception:
             logger.exception(f"Sitemap crawl failed for profile {profile_id}")
-            profile.crawl_status = "failed"
+            await session.rollback()
+            await session.execute(
+                update(WebsiteProfile)
+                .where(WebsiteProfile.id == profile_uuid)
+                .values(crawl_status="failed")
+            )
             await session.commit()
 
 
@@ -544,53 +641,99 @@ async def check_recrawl_schedules(ctx):
     session_factory = ctx["session_factory"]
     redis = ctx["redis"]
 
+    # Postgres decides which profiles are due; only their ids come back
+    now = datetime.now(UTC)
+    due = or_(
+        WebsiteProfile.last_crawled_at.is_(None),
+        *(
+            and_(
+                WebsiteProfile.recrawl_interval == interval,
+                WebsiteProfile.last_crawled_at <= now - timedelta(days=days),
+            )
+            for interval, days in RECRAWL_INTERVAL_DAYS.items()
+        ),
+    )
     async with session_factory() as session:
         result = await session.execute(
-            select(WebsiteProfile).where(
+            select(WebsiteProfile.id).where(
                 WebsiteProfile.recrawl_interval.isnot(None),
                 WebsiteProfile.crawl_status != "crawling",
+                due,
             )
         )
-        profiles = result.scalars().all()
-
-        now = datetime.now(UTC)
-        enqueued = 0
-        for profile in profiles:
-            if not profile.last_crawled_at:
-                await redis.enqueue_job("crawl_profile_sitemap", str(profile.id))
-                enqueued += 1
-                continue
-
-            delta = now - profile.last_crawled_at
-            if profile.recrawl_interval == "weekly" and delta.days >= 7:
-                await redis.enqueue_job("crawl_profile_sitemap", str(profile.id))
-                enqueued += 1
-            elif profile.recrawl_interval == "biweekly" and delta.days >= 14:
-                await redis.enqueue_job("crawl_profile_sitemap", str(profile.id))
-                enqueued += 1
-            elif profile.recrawl_interval == "monthly" and delta.days >= 30:
-                await redis.enqueue_job("crawl_profile_sitemap", str(profile.id))
-                enqueued += 1
-
-        logger.info(
-            f"Re-crawl check: {enqueued} profiles enqueued out of {len(profiles)}"
+        profile_ids = result.scalars().all()
+
+    # A stable job id makes ARQ drop the enqueue while the profile's last
+    # recrawl is still queued, running, or within its result retention
+    enqueued = 0
+    for profile_id in profile_ids:
+        job = await redis.enqueue_job(
+            "crawl_profile_sitemap", str(profile_id), _job_id=f"recrawl:{profile_id}"
         )
+        if job is not None:
+            enqueued += 1
+
+    logger.info(
+        f"Re-crawl check: {len(profile_ids)} profiles due, {enqueued} enqueued"
+    )
+
+
+def _warm_up() -> None:
+    """Pay first-use costs at startup rather than inside the first job.
+
+    Reads every stage's rule file into the rules cache and runs the edit
+    stage's readability scoring once, which loads textstat's syllable
+    dictionary.
+    """
+    for stage in STAGES:
+        load_rules(stage)
+    try:
+        compute_analytics("Warming up the readability scorer for the worker.")
+    except Exception:
+        logger.warning("Readability warm-up failed", exc_info=True)
+
+
+async def _warm_pool(engine: AsyncEngine, size: int) -> None:
+    """Open `size` pooled connections and hand them back to the pool.
+
+    Connecting (auth plus asyncpg's type introspection) happens here rather
+    than inside the first jobs. An unreachable database is only logged; jobs
+    will surface it on their own.
+    """
+    conns: list[AsyncConnection] = []
+    try:
+        for _ in range(size):
+            conns.append(await engine.connect())
+    except Exception:
+        logger.warning("Database pool warm-up failed", exc_info=True)
+    finally:
+        for conn in conns:
+            await conn.close()
 
 
 async def startup(ctx):
-    """Worker startup: create DB engine, session factory, and Redis reference."""
+    """Worker startup: create the DB engine and session factory, warm caches."""
     logger.info("Worker starting up")
-    engine = create_async_engine(settings.database_url, echo=False)
+    # Each job holds at most one connection at a time, so max_jobs covers the
+    # steady state; overflow stays for short-lived extra sessions
+    engine = create_async_engine(
+        settings.database_url, echo=False, pool_size=settings.worker_max_jobs
+    )
     ctx["session_factory"] = async_sessionmaker(
         engine, class_=AsyncSession, expire_on_commit=False
     )
-    # Store redis reference from ARQ context for DLQ operations
-    ctx["redis"] = ctx["redis"]
+    if settings.llm_cache_enabled:
+        llm_cache.attach_redis(ctx["redis"])
+    await _warm_pool(engine, settings.worker_max_jobs)
+    await asyncio.to_thread(_warm_up)
 
 
 async def shutdown(ctx):
     """Worker shutdown: dispose DB engine gracefully."""
     logger.info("Worker shutting down gracefully")
+    await close_llm_clients()
+    await close_link_client()
+    await close_sitemap_client()
     if "session_factory" in ctx:
         engine = ctx["session_factory"].kw.get("bind")
         if engine:
@@ -605,6 +748,7 @@ class WorkerSettings:
     on_startup = startup
     on_shutdown = shutdown
     max_jobs = settings.worker_max_jobs
+    poll_delay = settings.worker_poll_delay_s
     job_timeout = 3600  # 60 minutes — full 6-stage pipeline with extended thinking
     max_tries = MAX_ATTEMPTS
     retry_delay = 10  # seconds between retries
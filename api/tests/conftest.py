@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from src.database import get_session
 from src.main import app
@@ -19,14 +20,30 @@ TEST_DATABASE_URL = (
 )
 
 
+# Tables are rebuilt once per test run and emptied after each test; rebuilding
+# them for every test cost far more than the tests themselves
+_schema_ready = False
+_TRUNCATE_ALL = text(
+    "TRUNCATE "
+    + ", ".join(table.name for table in Base.metadata.sorted_tables)
+    + " RESTART IDENTITY CASCADE"
+)
+
+
 @pytest.fixture
 async def db_engine():
+    global _schema_ready  # noqa: PLW0603
     engine = create_async_engine(TEST_DATABASE_URL, echo=False)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    if not _schema_ready:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            # Link search indexes use trigram operator classes
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.run_sync(Base.metadata.create_all)
+        _schema_ready = True
     yield engine
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(_TRUNCATE_ALL)
     await engine.dispose()
 
 
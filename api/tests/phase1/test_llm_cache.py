@@ -0,0 +1,142 @@
+"""Tests for the LLM response cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from src.services import llm_cache as llm_cache_module
+from src.services.llm import ClaudeClient, LLMResponse
+from src.services.llm_cache import LLMCache, cache_key
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+
+@pytest.fixture
+def enabled_cache():
+    """Turn caching on against a fresh in-process cache."""
+    cache = LLMCache(max_entries=8)
+    with (
+        patch("src.services.llm.llm_cache", cache),
+        patch.object(llm_cache_module.settings, "llm_cache_enabled", True),
+    ):
+        yield cache
+
+
+def _claude_message(text: str = "Hello"):
+    message = MagicMock()
+    block = MagicMock(type="text", text=text)
+    message.content = [block]
+    message.usage.input_tokens = 10
+    message.usage.output_tokens = 5
+    message.usage.cache_read_input_tokens = 0
+    message.usage.cache_creation_input_tokens = 0
+    return message
+
+
+class TestCacheKey:
+    def test_stable_for_same_inputs(self):
+        assert cache_key("m", "sys", "prompt", max_tokens=1) == cache_key(
+            "m", "sys", "prompt", max_tokens=1
+        )
+
+    def test_changes_with_any_input(self):
+        base = cache_key("m", "sys", "prompt", max_tokens=1)
+        assert cache_key("other", "sys", "prompt", max_tokens=1) != base
+        assert cache_key("m", None, "prompt", max_tokens=1) != base
+        assert cache_key("m", "sys", "prompt!", max_tokens=1) != base
+        assert cache_key("m", "sys", "prompt", max_tokens=2) != base
+
+    def test_whitespace_differences_share_a_key(self):
+        assert cache_key("m", "sys ", "Write  about\n\ntopic\n") == cache_key(
+            "m", "sys", "Write about topic"
+        )
+        assert cache_key("m", None, "a b") != cache_key("m", "", "a b")
+
+
+class TestLLMCache:
+    async def test_lru_evicts_oldest(self):
+        cache = LLMCache(max_entries=2)
+        await cache.set("a", {"v": 1}, ttl=60)
+        await cache.set("b", {"v": 2}, ttl=60)
+        await cache.get("a")
+        await cache.set("c", {"v": 3}, ttl=60)
+
+        assert await cache.get("a") == {"v": 1}
+        assert await cache.get("b") is None
+        assert await cache.get("c") == {"v": 3}
+
+    async def test_expired_entries_miss(self):
+        cache = LLMCache()
+        await cache.set("a", {"v": 1}, ttl=-1)
+        assert await cache.get("a") is None
+
+    async def test_redis_tier_shared_between_processes(self):
+        redis = _FakeRedis()
+        writer, reader = LLMCache(), LLMCache()
+        writer.attach_redis(redis)
+        reader.attach_redis(redis)
+
+        await writer.set("a", {"v": 1}, ttl=3600)
+
+        assert redis.ttls["llm_cache:a"] == 3600
+        assert await reader.get("a") == {"v": 1}
+
+    async def test_redis_errors_are_misses(self):
+        redis = AsyncMock()
+        redis.get.side_effect = ConnectionError("down")
+        cache = LLMCache()
+        cache.attach_redis(redis)
+        assert await cache.get("a") is None
+
+
+class TestClaudeChatCache:
+    async def test_identical_call_served_from_cache(self, enabled_cache):
+        client = ClaudeClient(api_key="sk-ant-test")
+        with patch.object(
+            client._client.messages,
+            "create",
+            new_callable=AsyncMock,
+            return_value=_claude_message(),
+        ) as mock_create:
+            first = await client.chat("Write", system="sys")
+            second = await client.chat("Write", system="sys")
+
+        mock_create.assert_awaited_once()
+        assert second == first
+        assert isinstance(second, LLMResponse)
+
+    async def test_use_cache_false_always_calls_api(self, enabled_cache):
+        client = ClaudeClient(api_key="sk-ant-test")
+        with patch.object(
+            client._client.messages,
+            "create",
+            new_callable=AsyncMock,
+            return_value=_claude_message(),
+        ) as mock_create:
+            await client.chat("Write", use_cache=False)
+            await client.chat("Write", use_cache=False)
+
+        assert mock_create.await_count == 2
+
+    async def test_disabled_by_default(self):
+        client = ClaudeClient(api_key="sk-ant-test")
+        with patch.object(
+            client._client.messages,
+            "create",
+            new_callable=AsyncMock,
+            return_value=_claude_message(),
+        ) as mock_create:
+            await client.chat("Write")
+            await client.chat("Write")
+
+        assert mock_create.await_count == 2
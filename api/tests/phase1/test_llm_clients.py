@@ -1,9 +1,18 @@
 """Tests for LLM client wrappers (mocked — no API calls)."""
 
+import asyncio
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from src.services.llm import ClaudeClient, LLMResponse, PerplexityClient
+from src.services.llm import (
+    ClaudeBatcher,
+    ClaudeClient,
+    GeminiClient,
+    LLMResponse,
+    PerplexityClient,
+    shutdown_gemini_executor,
+)
 
 
 class TestPerplexityClient:
@@ -68,7 +77,12 @@ class TestClaudeClient:
         text_block.text = "Outline content here"
         mock_response = MagicMock()
         mock_response.content = [text_block]
-        mock_response.usage = MagicMock(input_tokens=200, output_tokens=1000)
+        mock_response.usage = MagicMock(
+            input_tokens=200,
+            output_tokens=1000,
+            cache_read_input_tokens=3000,
+            cache_creation_input_tokens=None,
+        )
 
         with patch.object(
             client._client.messages,
@@ -94,6 +108,26 @@ class TestClaudeClient:
             assert result.content == "Outline content here"
             assert result.tokens_in == 200
             assert result.tokens_out == 1000
+            assert result.cache_read_tokens == 3000
+            assert result.cache_write_tokens == 0
+
+    def test_rules_prefix_marked_for_prompt_caching(self):
+        params = ClaudeClient.message_params(
+            "RULES\n\n---\n\nPost config", cache_prefix="RULES"
+        )
+        content = params["messages"][0]["content"]
+        assert content == [
+            {
+                "type": "text",
+                "text": "RULES",
+                "cache_control": {"type": "ephemeral"},
+            },
+            {"type": "text", "text": "\n\n---\n\nPost config"},
+        ]
+
+    def test_prompt_left_whole_without_matching_prefix(self):
+        params = ClaudeClient.message_params("Post config", cache_prefix="RULES")
+        assert params["messages"][0]["content"] == "Post config"
 
     async def test_chat_filters_thinking_blocks(self, client):
         """Extended thinking response should only return text blocks."""
@@ -132,3 +166,106 @@ class TestClaudeClient:
         ) as mock_create:
             await client.chat("Write a draft")
             assert mock_create.call_args.kwargs["max_tokens"] == 16000
+
+    async def test_stream_delivers_text_and_returns_response(self, client):
+        text_block = MagicMock()
+        text_block.type = "text"
+        text_block.text = "Hello world"
+        final = MagicMock()
+        final.content = [text_block]
+        final.usage = MagicMock(input_tokens=10, output_tokens=2)
+
+        async def _text_stream():
+            for chunk in ("Hello", " world"):
+                yield chunk
+
+        stream = MagicMock()
+        stream.text_stream = _text_stream()
+        stream.get_final_message = AsyncMock(return_value=final)
+        manager = MagicMock()
+        manager.__aenter__ = AsyncMock(return_value=stream)
+        manager.__aexit__ = AsyncMock(return_value=False)
+
+        chunks: list[str] = []
+        with patch.object(client._client.messages, "stream", return_value=manager):
+            result = await client.stream("Say hello", on_text=chunks.append)
+
+        assert chunks == ["Hello", " world"]
+        assert result.content == "Hello world"
+        assert result.tokens_out == 2
+
+
+class TestClaudeBatcher:
+    @pytest.fixture
+    def client(self):
+        client = MagicMock(spec=ClaudeClient)
+        client.batch_submit = AsyncMock(return_value="msgbatch_1")
+        return client
+
+    async def test_coalesces_requests_within_window(self, client):
+        async def poll(batch_id):
+            requests = client.batch_submit.call_args.args[0]
+            return {
+                custom_id: LLMResponse(
+                    content=params["messages"][0]["content"],
+                    model="claude-opus-4-6",
+                    tokens_in=1,
+                    tokens_out=1,
+                )
+                for custom_id, params in requests
+            }
+
+        client.batch_poll = AsyncMock(side_effect=poll)
+        batcher = ClaudeBatcher(client, window_s=0.01, poll_interval_s=0)
+
+        results = await asyncio.gather(
+            batcher.submit(ClaudeClient.message_params("one")),
+            batcher.submit(ClaudeClient.message_params("two")),
+        )
+
+        client.batch_submit.assert_called_once()
+        assert [r.content for r in results] == ["one", "two"]
+
+    async def test_flushes_at_max_size(self, client):
+        client.batch_poll = AsyncMock(return_value={})
+        batcher = ClaudeBatcher(client, window_s=60, max_size=1, poll_interval_s=0)
+
+        with pytest.raises(RuntimeError, match="missing result"):
+            await asyncio.wait_for(
+                batcher.submit(ClaudeClient.message_params("one")), timeout=1
+            )
+
+    async def test_submit_failure_fails_every_request(self, client):
+        client.batch_submit = AsyncMock(side_effect=RuntimeError("batch rejected"))
+        batcher = ClaudeBatcher(client, window_s=0.01)
+
+        results = await asyncio.gather(
+            batcher.submit(ClaudeClient.message_params("one")),
+            batcher.submit(ClaudeClient.message_params("two")),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestGeminiClient:
+    async def test_generate_image_runs_in_gemini_pool(self):
+        client = GeminiClient(api_key="gemini-test-key")
+        threads: list[str] = []
+
+        def generate_content(**kwargs):
+            threads.append(threading.current_thread().name)
+            part = MagicMock()
+            part.inline_data.data = b"png"
+            return MagicMock(parts=[part], usage_metadata=None)
+
+        try:
+            with patch.object(
+                client._client.models, "generate_content", generate_content
+            ):
+                result = await client.generate_image("A red barn")
+        finally:
+            shutdown_gemini_executor()
+
+        assert result.image_bytes == b"png"
+        assert threads[0].startswith("gemini")
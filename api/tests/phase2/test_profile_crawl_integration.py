@@ -7,9 +7,14 @@ import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.link import InternalLink
+from src.models.post import Post
 from src.models.profile import WebsiteProfile
 from src.services.sitemap import SitemapEntry
-from src.worker import crawl_profile_sitemap
+from src.worker import (
+    _fetch_internal_links,
+    _slug_from_url,
+    crawl_profile_sitemap,
+)
 
 
 @pytest.fixture
@@ -149,3 +154,79 @@ class TestCrawlIntegration:
             lnk for lnk in links if lnk.url == "https://crawltest.com/page/"
         )
         assert page_link.title == "New Title"  # Updated
+
+    async def test_crawl_keeps_title_and_merges_duplicate_urls(
+        self, db_session, db_engine, profile_in_db
+    ):
+        """Untitled re-crawls keep stored titles; repeated URLs are one row."""
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+        session_factory = async_sessionmaker(
+            db_engine, class_=AsyncSession, expire_on_commit=False
+        )
+        ctx = {"session_factory": session_factory}
+
+        with patch("src.worker.crawl_sitemap", new_callable=AsyncMock) as mock_crawl:
+            mock_crawl.return_value = [
+                SitemapEntry(url="https://crawltest.com/page/", title="Kept"),
+            ]
+            await crawl_profile_sitemap(ctx, str(profile_in_db.id))
+
+        # The same URL listed by two sub-sitemaps, neither with a title
+        with patch("src.worker.crawl_sitemap", new_callable=AsyncMock) as mock_crawl:
+            mock_crawl.return_value = [
+                SitemapEntry(url="https://crawltest.com/page/"),
+                SitemapEntry(url="https://crawltest.com/page/"),
+            ]
+            await crawl_profile_sitemap(ctx, str(profile_in_db.id))
+
+        result = await db_session.execute(
+            select(InternalLink).where(InternalLink.profile_id == profile_in_db.id)
+        )
+        links = result.scalars().all()
+        assert len(links) == 1
+        assert links[0].title == "Kept"
+
+    async def test_links_fetched_through_post(
+        self, db_session, db_engine, profile_in_db
+    ):
+        """Pipeline link loading resolves the profile from the post itself."""
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+        session_factory = async_sessionmaker(
+            db_engine, class_=AsyncSession, expire_on_commit=False
+        )
+        ctx = {"session_factory": session_factory}
+
+        with patch("src.worker.crawl_sitemap", new_callable=AsyncMock) as mock_crawl:
+            mock_crawl.return_value = [
+                SitemapEntry(url="https://crawltest.com/blog/a/", title="A"),
+            ]
+            await crawl_profile_sitemap(ctx, str(profile_in_db.id))
+
+        linked = Post(slug="linked", topic="Linked", profile_id=profile_in_db.id)
+        unlinked = Post(slug="unlinked", topic="Unlinked")
+        db_session.add_all([linked, unlinked])
+        await db_session.commit()
+
+        assert await _fetch_internal_links(db_session, linked.id) == [
+            {"url": "https://crawltest.com/blog/a/", "title": "A", "slug": "a"}
+        ]
+        assert await _fetch_internal_links(db_session, unlinked.id) == []
+
+
+@pytest.mark.parametrize(
+    ("url", "slug"),
+    [
+        ("https://crawltest.com/blog/post-1/", "post-1"),
+        ("https://crawltest.com/blog/post-1", "post-1"),
+        ("https://crawltest.com/blog/post-1///?utm=x#top", "post-1"),
+        ("https://crawltest.com:8080/guide.html", "guide.html"),
+        ("https://crawltest.com/?page=/blog/x", None),
+        ("https://crawltest.com/", None),
+        ("https://crawltest.com", None),
+        ("/relative/post-2/", "post-2"),
+    ],
+)
+def test_slug_from_url(url, slug):
+    assert _slug_from_url(url) == slug
@@ -1,13 +1,17 @@
 """Integration tests for sitemap crawler with httpx mocks."""
 
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 from unittest.mock import AsyncMock
 
 import httpx
+from src.services import sitemap
 from src.services.sitemap import (
     crawl_sitemap,
     discover_sitemaps,
     fetch_and_parse_sitemap,
+    fetch_page_title,
 )
 
 FIXTURES = Path(__file__).parent.parent / "fixtures"
@@ -29,6 +33,16 @@ def _mock_response(
     return resp
 
 
+def _mock_stream(get):
+    """Adapt an async `get(url, **kwargs)` mock into a client.stream() mock."""
+
+    @asynccontextmanager
+    async def stream(method, url, **kwargs):
+        yield await get(url, **kwargs)
+
+    return stream
+
+
 class TestDiscoverSitemaps:
     async def test_discovers_from_robots_txt(self):
         client = AsyncMock(spec=httpx.AsyncClient)
@@ -122,6 +136,31 @@ class TestFetchAndParseSitemap:
         # 2 pages + 2 posts + 1 product = 5
         assert len(entries) == 5
 
+    async def test_sub_sitemaps_fetched_concurrently(self):
+        index_content = (FIXTURES / "sitemap_index.xml").read_bytes()
+        pages_content = (FIXTURES / "sub_sitemap_pages.xml").read_bytes()
+        started: list[str] = []
+        release = asyncio.Event()
+
+        async def mock_get(url, **kwargs):
+            if url == "https://example.com/sitemap.xml":
+                return _mock_response(index_content)
+            started.append(url)
+            # Every child must be in flight before any of them completes
+            if len(started) == 3:
+                release.set()
+            await asyncio.wait_for(release.wait(), timeout=1)
+            return _mock_response(pages_content)
+
+        client = AsyncMock(spec=httpx.AsyncClient)
+        client.get = AsyncMock(side_effect=mock_get)
+
+        entries = await fetch_and_parse_sitemap(
+            "https://example.com/sitemap.xml", client
+        )
+        assert len(started) == 3
+        assert len(entries) == 6
+
     async def test_fetch_failure_returns_empty(self):
         client = AsyncMock(spec=httpx.AsyncClient)
         client.get = AsyncMock(
@@ -145,6 +184,38 @@ class TestFetchAndParseSitemap:
         # Depth 1: parses index, but sub-sitemaps at depth 0 are skipped
         assert entries == []
 
+    async def test_cyclic_indexes_fetched_once(self):
+        def index(*locs):
+            items = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+            return _mock_response(
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                f"{items}</sitemapindex>"
+            )
+
+        pages_content = (FIXTURES / "sub_sitemap_pages.xml").read_bytes()
+        responses = {
+            "https://example.com/a.xml": index(
+                "https://example.com/b.xml", "https://example.com/pages.xml"
+            ),
+            "https://example.com/b.xml": index(
+                "https://example.com/a.xml", "https://example.com/pages.xml/"
+            ),
+            "https://example.com/pages.xml": _mock_response(pages_content),
+        }
+
+        async def mock_get(url, **kwargs):
+            return responses[url]
+
+        client = AsyncMock(spec=httpx.AsyncClient)
+        client.get = AsyncMock(side_effect=mock_get)
+
+        entries = await fetch_and_parse_sitemap(
+            "https://example.com/a.xml", client, max_depth=10
+        )
+        fetched = [call.args[0] for call in client.get.await_args_list]
+        assert sorted(fetched) == sorted(responses)
+        assert len(entries) == 2
+
 
 class TestCrawlSitemap:
     async def test_full_crawl(self):
@@ -166,6 +237,36 @@ class TestCrawlSitemap:
         assert len(entries) == 10
         assert entries[0].url == "https://example.com/page-1/"
 
+    async def test_fetch_titles_concurrently_with_bound(self, monkeypatch):
+        monkeypatch.setattr(sitemap, "TITLE_FETCH_CONCURRENCY", 3)
+        simple_content = (FIXTURES / "simple_sitemap.xml").read_bytes()
+        in_flight = 0
+        peak = 0
+
+        async def mock_get(url, **kwargs):
+            nonlocal in_flight, peak
+            if "robots.txt" in url:
+                return _mock_response("", status_code=404)
+            if "sitemap.xml" in url:
+                return _mock_response(simple_content)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _mock_response(
+                f"<html><title>{url}</title></html>", content_type="text/html"
+            )
+
+        client = AsyncMock(spec=httpx.AsyncClient)
+        client.get = AsyncMock(side_effect=mock_get)
+        client.stream = _mock_stream(mock_get)
+
+        entries = await crawl_sitemap(
+            "https://example.com", fetch_titles=True, client=client
+        )
+        assert [e.title for e in entries] == [e.url for e in entries]
+        assert peak == 3
+
     async def test_crawl_no_sitemaps(self):
         async def mock_get(url, **kwargs):
             return _mock_response("", status_code=404)
@@ -176,3 +277,64 @@ class TestCrawlSitemap:
 
         entries = await crawl_sitemap("https://example.com", client=client)
         assert entries == []
+
+
+class TestSharedClient:
+    async def test_shared_client_reused_until_closed(self):
+        client = sitemap._get_client()
+        assert sitemap._get_client() is client
+
+        await sitemap.close_sitemap_client()
+
+        assert client.is_closed
+        assert sitemap._get_client() is not client
+        await sitemap.close_sitemap_client()
+
+
+class TestFetchPageTitle:
+    async def _title(
+        self, body: str | bytes, content_type: str = "text/html", status: int = 200
+    ):
+        client = AsyncMock(spec=httpx.AsyncClient)
+        client.stream = _mock_stream(
+            AsyncMock(return_value=_mock_response(body, status, content_type))
+        )
+        return await fetch_page_title("https://example.com/", client)
+
+    async def test_extracts_and_unescapes_title(self):
+        body = '<html><head><TITLE lang="en">\n  Tips &amp; Tricks </TITLE></head>'
+        assert await self._title(body) == "Tips & Tricks"
+
+    async def test_missing_title(self):
+        assert await self._title("<html><head></head><body>x</body></html>") is None
+
+    async def test_non_html_skipped(self):
+        assert await self._title("<title>x</title>", "application/json") is None
+
+    async def test_http_error_returns_none(self):
+        assert await self._title("<title>Not Found</title>", status=404) is None
+
+    async def test_decodes_declared_charset(self):
+        body = "<title>Café</title>".encode("latin-1")
+        assert await self._title(body, "text/html; charset=iso-8859-1") == "Café"
+
+    async def test_stops_reading_after_title(self):
+        chunks_read = 0
+
+        async def body():
+            nonlocal chunks_read
+            for chunk in (b"<html><title>Early</title>", b"x" * 100_000):
+                chunks_read += 1
+                yield chunk
+
+        resp = httpx.Response(
+            200,
+            headers={"content-type": "text/html"},
+            content=body(),
+            request=httpx.Request("GET", "https://example.com/"),
+        )
+        client = AsyncMock(spec=httpx.AsyncClient)
+        client.stream = _mock_stream(AsyncMock(return_value=resp))
+
+        assert await fetch_page_title("https://example.com/", client) == "Early"
+        assert chunks_read == 1
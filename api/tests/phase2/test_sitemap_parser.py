@@ -33,6 +33,12 @@ class TestParseSitemapXml:
         sub_sitemaps, entries = parse_sitemap_xml(compressed)
         assert len(entries) == 10
 
+    def test_truncated_gzip_raises_parse_error(self):
+        raw = (FIXTURES / "simple_sitemap.xml").read_bytes()
+        compressed = gzip.compress(raw)
+        with pytest.raises(SitemapParseError):
+            parse_sitemap_xml(compressed[: len(compressed) // 2])
+
     def test_malformed_xml_missing_loc(self):
         content = (FIXTURES / "malformed_sitemap.xml").read_bytes()
         # Should not crash - just skip entries without <loc>
@@ -65,6 +71,23 @@ class TestParseSitemapXml:
         assert len(has_lastmod) > 0
         assert len(no_lastmod) > 0
 
+    def test_large_sitemap_keeps_order(self):
+        urls = "".join(
+            f"<url><loc>https://example.com/p-{i}/</loc>"
+            f"<changefreq>weekly</changefreq><lastmod>2024-01-01</lastmod></url>"
+            for i in range(5000)
+        )
+        xml = (
+            '<?xml version="1.0"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"{urls}</urlset>"
+        ).encode()
+        _, entries = parse_sitemap_xml(xml)
+        assert len(entries) == 5000
+        assert entries[0].url == "https://example.com/p-0/"
+        assert entries[-1].url == "https://example.com/p-4999/"
+        assert all(e.lastmod == "2024-01-01" for e in entries)
+
 
 class TestParseRobotsTxt:
     def test_single_sitemap(self):
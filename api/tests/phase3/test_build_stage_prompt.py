@@ -0,0 +1,29 @@
+"""Tests for build_stage_prompt."""
+
+import pytest
+from src.pipeline.helpers import build_stage_prompt
+
+
+@pytest.fixture
+def sample_state():
+    return {
+        "post_id": "test-123",
+        "topic": "Best Python Frameworks",
+        "niche": "technology",
+        "research": "# Research\n\nKeywords: python, django",
+    }
+
+
+def test_includes_rules_config_and_previous_output(sample_state):
+    prompt = build_stage_prompt("outline", "# Outline rules", sample_state)
+    assert prompt.startswith("# Outline rules")
+    assert "- **BLOG_POST_TOPIC**: Best Python Frameworks" in prompt
+    assert "## Previous Stage Output\n\n# Research" in prompt
+
+
+def test_changed_state_rebuilds_prompt(sample_state):
+    first = build_stage_prompt("outline", "rules", sample_state)
+    changed = {**sample_state, "research": "# Different research"}
+    second = build_stage_prompt("outline", "rules", changed)
+    assert first != second
+    assert "# Different research" in second
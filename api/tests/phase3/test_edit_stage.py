@@ -60,7 +60,7 @@ class TestEditNode:
         self, sample_state, mock_claude_response_both
     ):
         """Edit stage always outputs markdown only (WP HTML at publish time)."""
-        with patch("src.pipeline.stages.edit.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.edit.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response_both)
             instance.close = AsyncMock()
@@ -76,7 +76,7 @@ class TestEditNode:
         self, sample_state, mock_claude_response_md_only
     ):
         sample_state["output_format"] = "markdown"
-        with patch("src.pipeline.stages.edit.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.edit.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response_md_only)
             instance.close = AsyncMock()
@@ -91,7 +91,7 @@ class TestEditNode:
     async def test_internal_links_in_prompt(
         self, sample_state, mock_claude_response_both
     ):
-        with patch("src.pipeline.stages.edit.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.edit.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response_both)
             instance.close = AsyncMock()
@@ -108,7 +108,7 @@ class TestEditNode:
 
     @pytest.mark.asyncio
     async def test_updates_stage_status(self, sample_state, mock_claude_response_both):
-        with patch("src.pipeline.stages.edit.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.edit.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response_both)
             instance.close = AsyncMock()
@@ -132,7 +132,7 @@ class TestEditNode:
             "python frameworks",
             "django vs flask",
         ]
-        with patch("src.pipeline.stages.edit.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.edit.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response_both)
             instance.close = AsyncMock()
@@ -156,7 +156,7 @@ class TestEditNode:
         """Analytics section should be skipped when draft is empty."""
         sample_state["draft"] = ""
         sample_state["related_keywords"] = ["python frameworks"]
-        with patch("src.pipeline.stages.edit.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.edit.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response_both)
             instance.close = AsyncMock()
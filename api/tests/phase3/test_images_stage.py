@@ -1,13 +1,22 @@
 """Tests for the images stage node."""
 
+import asyncio
 import io
 import json
+import threading
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from PIL import Image
 
-from src.pipeline.stages.images import _parse_manifest, images_node, optimize_image
+from src.pipeline.stages.images import (
+    _ManifestStream,
+    _parse_manifest,
+    _save_image,
+    images_node,
+    optimize_image,
+)
 from src.services.llm import ImageGenResponse, LLMResponse
 
 
@@ -28,6 +37,18 @@ def _make_image_response(width: int = 100, height: int = 80) -> ImageGenResponse
     )
 
 
+def _mock_claude_stream(claude, response: LLMResponse, chunk_size: int = 40):
+    """Make claude.stream deliver response.content in chunks, then return it."""
+
+    async def _stream(prompt, on_text, **kwargs):
+        for start in range(0, len(response.content), chunk_size):
+            on_text(response.content[start : start + chunk_size])
+            await asyncio.sleep(0)
+        return response
+
+    claude.stream = AsyncMock(side_effect=_stream)
+
+
 @pytest.fixture
 def sample_state():
     return {
@@ -81,11 +102,11 @@ class TestImagesNode:
         self, sample_state, mock_claude_response
     ):
         with (
-            patch("src.pipeline.stages.images.ClaudeClient") as MockClaude,
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
             patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
         ):
             claude = MockClaude.return_value
-            claude.chat = AsyncMock(return_value=mock_claude_response)
+            _mock_claude_stream(claude, mock_claude_response)
             claude.close = AsyncMock()
 
             gemini = MockGemini.return_value
@@ -109,11 +130,11 @@ class TestImagesNode:
         self, sample_state, mock_claude_response
     ):
         with (
-            patch("src.pipeline.stages.images.ClaudeClient") as MockClaude,
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
             patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
         ):
             claude = MockClaude.return_value
-            claude.chat = AsyncMock(return_value=mock_claude_response)
+            _mock_claude_stream(claude, mock_claude_response)
             claude.close = AsyncMock()
 
             gemini = MockGemini.return_value
@@ -134,11 +155,11 @@ class TestImagesNode:
     @pytest.mark.asyncio
     async def test_featured_image_uses_2k(self, sample_state, mock_claude_response):
         with (
-            patch("src.pipeline.stages.images.ClaudeClient") as MockClaude,
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
             patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
         ):
             claude = MockClaude.return_value
-            claude.chat = AsyncMock(return_value=mock_claude_response)
+            _mock_claude_stream(claude, mock_claude_response)
             claude.close = AsyncMock()
 
             gemini = MockGemini.return_value
@@ -150,6 +171,211 @@ class TestImagesNode:
             first_call = gemini.generate_image.call_args_list[0]
             assert first_call.kwargs["image_size"] == "2K"
 
+    @pytest.mark.asyncio
+    async def test_featured_filenames_are_unique(
+        self, sample_state, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr(
+            "src.pipeline.stages.images.settings.media_dir", str(tmp_path)
+        )
+        manifest = {
+            "images": [
+                {"placement": "featured", "prompt": f"Hero {i}"} for i in range(4)
+            ]
+        }
+        response = LLMResponse(
+            content=json.dumps(manifest),
+            model="claude-opus-4-6",
+            tokens_in=10,
+            tokens_out=20,
+        )
+        with (
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
+            patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
+        ):
+            _mock_claude_stream(MockClaude.return_value, response)
+            gemini = MockGemini.return_value
+            gemini.generate_image = AsyncMock(return_value=_make_image_response())
+
+            result = await images_node(sample_state)
+
+        urls = [img["url"] for img in result["image_manifest"]["images"]]
+        assert len(set(urls)) == 4
+        assert all("/featured-" in url and url.endswith(".webp") for url in urls)
+
+    @pytest.mark.asyncio
+    async def test_generation_starts_while_manifest_streams(
+        self, sample_state, mock_claude_response
+    ):
+        calls_before_stream_end = []
+
+        with (
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
+            patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
+        ):
+            gemini = MockGemini.return_value
+            gemini.generate_image = AsyncMock(return_value=_make_image_response())
+
+            async def _stream(prompt, on_text, **kwargs):
+                content = mock_claude_response.content
+                split = content.index("}", content.index('"images"')) + 1
+                on_text(content[:split])
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+                calls_before_stream_end.append(gemini.generate_image.await_count)
+                on_text(content[split:])
+                return mock_claude_response
+
+            MockClaude.return_value.stream = AsyncMock(side_effect=_stream)
+            result = await images_node(sample_state)
+
+        assert calls_before_stream_end == [1]
+        assert result["image_manifest"]["total_generated"] == 2
+
+    @pytest.mark.asyncio
+    async def test_promptless_spec_reported_as_failed(self, sample_state):
+        """A complete manifest's prompt-less spec is kept as a failed entry."""
+        content = json.dumps(
+            {"images": [{"prompt": "A"}, {"alt_text": "x"}, {"prompt": "C"}]}
+        )
+        response = LLMResponse(
+            content=content, model="claude-opus-4-6", tokens_in=10, tokens_out=50
+        )
+        with (
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
+            patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
+        ):
+            _mock_claude_stream(MockClaude.return_value, response)
+            gemini = MockGemini.return_value
+            gemini.generate_image = AsyncMock(return_value=_make_image_response())
+            result = await images_node(sample_state)
+
+        manifest = result["image_manifest"]
+        assert manifest["total_generated"] == 2
+        assert manifest["total_failed"] == 1
+        failed = [img for img in manifest["images"] if not img["generated"]]
+        assert failed == [
+            {"alt_text": "x", "generated": False, "error": "no prompt", "index": 2}
+        ]
+        assert gemini.generate_image.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_truncated_stream_skips_promptless_specs(self, sample_state):
+        """Streamed and recovered specs agree when one spec has no prompt."""
+        content = (
+            '{"style_brief": {}, "images": [{"prompt": "A"}, {"alt_text": "x"}, '
+            '{"prompt": "C"}, {"prompt": "D"}, {"prompt": "E'
+        )
+        response = LLMResponse(
+            content=content, model="claude-opus-4-6", tokens_in=10, tokens_out=8000
+        )
+        with (
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
+            patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
+        ):
+            _mock_claude_stream(MockClaude.return_value, response, chunk_size=10)
+            gemini = MockGemini.return_value
+            gemini.generate_image = AsyncMock(return_value=_make_image_response())
+            result = await images_node(sample_state)
+
+        manifest = result["image_manifest"]
+        assert [img["prompt"] for img in manifest["images"]] == ["A", "C", "D"]
+        assert manifest["total_generated"] == 3
+        assert manifest["total_failed"] == 0
+        assert gemini.generate_image.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_parse_error_waits_for_and_removes_streamed_images(
+        self, sample_state, monkeypatch, tmp_path
+    ):
+        """A failed manifest leaves no image written, even one mid-save."""
+        monkeypatch.setattr(
+            "src.pipeline.stages.images.settings.media_dir", str(tmp_path)
+        )
+        saving = threading.Event()
+
+        def _slow_save(*args):
+            saving.set()
+            time.sleep(0.1)
+            return _save_image(*args)
+
+        async def _stream(prompt, on_text, **kwargs):
+            on_text('{"images": [{"prompt": "A"}, ')
+            await asyncio.to_thread(saving.wait, 2)
+            return LLMResponse(
+                content="not json", model="claude-opus-4-6", tokens_in=1, tokens_out=1
+            )
+
+        with (
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
+            patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
+            patch("src.pipeline.stages.images._save_image", side_effect=_slow_save),
+        ):
+            MockClaude.return_value.stream = AsyncMock(side_effect=_stream)
+            gemini = MockGemini.return_value
+            gemini.generate_image = AsyncMock(return_value=_make_image_response())
+            result = await images_node(sample_state)
+
+        assert result["stage_status"]["images"] == "failed"
+        await asyncio.sleep(0.2)
+        assert list((tmp_path / "test-123").iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_restart_removes_images_from_discarded_stream(
+        self, sample_state, monkeypatch, tmp_path
+    ):
+        """Images from streamed specs the parse disagrees with are deleted."""
+        monkeypatch.setattr(
+            "src.pipeline.stages.images.settings.media_dir", str(tmp_path)
+        )
+        parsed = LLMResponse(
+            content=json.dumps({"images": [{"prompt": "A", "filename": "a.png"}]}),
+            model="claude-opus-4-6",
+            tokens_in=1,
+            tokens_out=1,
+        )
+
+        async def _stream(prompt, on_text, **kwargs):
+            on_text('{"images": [{"prompt": "X", "filename": "x.png"}, ')
+            for _ in range(20):
+                await asyncio.sleep(0.01)
+            return parsed
+
+        with (
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
+            patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
+        ):
+            MockClaude.return_value.stream = AsyncMock(side_effect=_stream)
+            gemini = MockGemini.return_value
+            gemini.generate_image = AsyncMock(return_value=_make_image_response())
+            result = await images_node(sample_state)
+
+        images = result["image_manifest"]["images"]
+        assert [img["prompt"] for img in images] == ["A"]
+        files = sorted(p.name for p in (tmp_path / "test-123").iterdir())
+        assert files == ["a.webp"]
+
+    @pytest.mark.asyncio
+    async def test_batched_manifest_generates_after_parsing(
+        self, sample_state, mock_claude_response, monkeypatch
+    ):
+        monkeypatch.setattr("src.pipeline.helpers.settings.claude_batch_enabled", True)
+        with (
+            patch("src.pipeline.stages.images.get_claude_client") as MockClaude,
+            patch(
+                "src.pipeline.stages.images.claude_chat",
+                AsyncMock(return_value=mock_claude_response),
+            ) as chat,
+            patch("src.pipeline.stages.images.GeminiClient") as MockGemini,
+        ):
+            gemini = MockGemini.return_value
+            gemini.generate_image = AsyncMock(return_value=_make_image_response())
+            result = await images_node(sample_state)
+
+        chat.assert_awaited_once()
+        MockClaude.return_value.stream.assert_not_called()
+        assert result["image_manifest"]["total_generated"] == 2
+
 
 class TestParseManifest:
     def test_parses_valid_json(self):
@@ -172,6 +398,42 @@ class TestParseManifest:
         result = _parse_manifest("")
         assert "error" in result
 
+    def test_recovers_complete_specs_from_truncated_output(self):
+        raw = (
+            '```json\n{"style_brief": {"overall_style": "flat"},\n'
+            '"images": [\n{"prompt": "first", "alt_text": "a"},\n'
+            '{"prompt": "second", "alt_text": "b"},\n{"prompt": "thi'
+        )
+        result = _parse_manifest(raw)
+        assert "error" not in result
+        assert result["truncated"] is True
+        assert [img["prompt"] for img in result["images"]] == ["first", "second"]
+        assert result["style_brief"] == {"overall_style": "flat"}
+
+    def test_truncated_output_without_complete_specs_is_an_error(self):
+        result = _parse_manifest('{"images": [{"prompt": "cut off')
+        assert "error" in result
+        assert result["images"] == []
+
+
+class TestManifestStream:
+    def test_emits_each_spec_once_complete(self):
+        stream = _ManifestStream()
+        assert stream.feed('{"style_brief": {}, "images": [{"prompt": "a"') == []
+        assert stream.feed('}, {"prompt": "b"}') == [{"prompt": "a"}, {"prompt": "b"}]
+        assert stream.feed("]}") == []
+
+    def test_skips_specs_without_a_prompt(self):
+        stream = _ManifestStream()
+        specs = stream.feed('{"images": [{"prompt": "a"}, {"alt_text": "x"}, 7, ')
+        assert specs == [{"prompt": "a"}]
+
+    def test_ignores_text_after_array_end(self):
+        stream = _ManifestStream()
+        assert stream.feed('{"images": [{"prompt": "a"}], "extra": [{"x": 1}]}') == [
+            {"prompt": "a"}
+        ]
+
 
 class TestOptimizeImage:
     def test_converts_to_webp(self):
@@ -195,3 +457,10 @@ class TestOptimizeImage:
         img = Image.open(io.BytesIO(result))
         assert img.width == 800
         assert img.height == 600
+
+    def test_save_image_writes_optimized_webp(self, tmp_path):
+        filename, size = _save_image(_make_png(1600, 900), tmp_path, "hero", 1200)
+        assert filename == "hero.webp"
+        written = (tmp_path / filename).read_bytes()
+        assert len(written) == size
+        assert Image.open(io.BytesIO(written)).width == 1200
@@ -0,0 +1,41 @@
+"""Tests for load_rules and its mtime-checked cache."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from src.pipeline import helpers
+from src.pipeline.helpers import load_rules
+
+
+@pytest.fixture(autouse=True)
+def rules_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(helpers.settings, "rules_dir", str(tmp_path))
+    helpers._RULES_CACHE.clear()
+    yield tmp_path
+    helpers._RULES_CACHE.clear()
+
+
+def test_missing_file_returns_empty(rules_dir):
+    assert load_rules("outline") == ""
+
+
+def test_unchanged_file_is_read_once(rules_dir):
+    (rules_dir / "blog-outline.md").write_text("# Outline rules", encoding="utf-8")
+    with patch.object(
+        helpers.Path, "read_text", autospec=True, side_effect=helpers.Path.read_text
+    ) as read_text:
+        assert load_rules("outline") == "# Outline rules"
+        assert load_rules("outline") == "# Outline rules"
+    assert read_text.call_count == 1
+
+
+def test_edited_file_is_reloaded(rules_dir):
+    path = rules_dir / "blog-outline.md"
+    path.write_text("old rules", encoding="utf-8")
+    assert load_rules("outline") == "old rules"
+
+    path.write_text("new rules", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_rules("outline") == "new rules"
@@ -38,7 +38,7 @@ def mock_claude_response():
 class TestOutlineNode:
     @pytest.mark.asyncio
     async def test_returns_outline_content(self, sample_state, mock_claude_response):
-        with patch("src.pipeline.stages.outline.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.outline.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response)
             instance.close = AsyncMock()
@@ -53,7 +53,7 @@ class TestOutlineNode:
     async def test_prompt_includes_research_output(
         self, sample_state, mock_claude_response
     ):
-        with patch("src.pipeline.stages.outline.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.outline.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response)
             instance.close = AsyncMock()
@@ -68,7 +68,7 @@ class TestOutlineNode:
 
     @pytest.mark.asyncio
     async def test_includes_stage_meta(self, sample_state, mock_claude_response):
-        with patch("src.pipeline.stages.outline.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.outline.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response)
             instance.close = AsyncMock()
@@ -68,3 +68,25 @@ class TestPostCompletionHook:
         fake_id = str(uuid.uuid4())
         # Should not raise
         await _post_completion_hook(db_session, fake_id, {})
+
+    @pytest.mark.asyncio
+    async def test_wordpress_publish_flag_committed_with_completion(
+        self, db_session, post_in_db, profile_in_db
+    ):
+        profile_in_db.wp_url = "https://testblog.com"
+        profile_in_db.wp_username = "editor"
+        profile_in_db.wp_app_password = "encrypted"
+        post_in_db.output_format = "wordpress"
+        await db_session.commit()
+
+        await _post_completion_hook(db_session, str(post_in_db.id), {})
+        await db_session.rollback()
+
+        result = await db_session.execute(
+            select(Post)
+            .where(Post.id == post_in_db.id)
+            .execution_options(populate_existing=True)
+        )
+        post = result.scalar_one()
+        assert post.current_stage == "complete"
+        assert post.wp_publish_status == "pending"
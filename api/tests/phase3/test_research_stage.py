@@ -87,7 +87,7 @@ class TestResearchNode:
     async def test_returns_research_content(
         self, sample_state, mock_perplexity_response
     ):
-        with patch("src.pipeline.stages.research.PerplexityClient") as MockClient:
+        with patch("src.pipeline.stages.research.get_perplexity_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_perplexity_response)
             instance.close = AsyncMock()
@@ -99,7 +99,7 @@ class TestResearchNode:
 
     @pytest.mark.asyncio
     async def test_updates_stage_status(self, sample_state, mock_perplexity_response):
-        with patch("src.pipeline.stages.research.PerplexityClient") as MockClient:
+        with patch("src.pipeline.stages.research.get_perplexity_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_perplexity_response)
             instance.close = AsyncMock()
@@ -111,7 +111,7 @@ class TestResearchNode:
 
     @pytest.mark.asyncio
     async def test_includes_stage_meta(self, sample_state, mock_perplexity_response):
-        with patch("src.pipeline.stages.research.PerplexityClient") as MockClient:
+        with patch("src.pipeline.stages.research.get_perplexity_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_perplexity_response)
             instance.close = AsyncMock()
@@ -127,7 +127,7 @@ class TestResearchNode:
 
     @pytest.mark.asyncio
     async def test_prompt_includes_topic(self, sample_state, mock_perplexity_response):
-        with patch("src.pipeline.stages.research.PerplexityClient") as MockClient:
+        with patch("src.pipeline.stages.research.get_perplexity_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_perplexity_response)
             instance.close = AsyncMock()
@@ -141,27 +141,26 @@ class TestResearchNode:
             assert "Best Python Frameworks" in prompt
 
     @pytest.mark.asyncio
-    async def test_closes_client_on_success(
+    async def test_leaves_shared_client_open(
         self, sample_state, mock_perplexity_response
     ):
-        with patch("src.pipeline.stages.research.PerplexityClient") as MockClient:
+        with patch("src.pipeline.stages.research.get_perplexity_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_perplexity_response)
             instance.close = AsyncMock()
 
             await research_node(sample_state)
-            instance.close.assert_awaited_once()
+            instance.close.assert_not_awaited()
 
     @pytest.mark.asyncio
-    async def test_closes_client_on_error(self, sample_state):
-        with patch("src.pipeline.stages.research.PerplexityClient") as MockClient:
+    async def test_propagates_client_error(self, sample_state):
+        with patch("src.pipeline.stages.research.get_perplexity_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(side_effect=RuntimeError("API error"))
             instance.close = AsyncMock()
 
             with pytest.raises(RuntimeError, match="API error"):
                 await research_node(sample_state)
-            instance.close.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_retries_on_meta_response(self, sample_state):
@@ -173,7 +172,7 @@ class TestResearchNode:
             content=VALID_RESEARCH, model="sonar-pro", tokens_in=500, tokens_out=3000
         )
 
-        with patch("src.pipeline.stages.research.PerplexityClient") as MockClient:
+        with patch("src.pipeline.stages.research.get_perplexity_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(side_effect=[meta_resp, valid_resp])
             instance.close = AsyncMock()
@@ -196,7 +195,7 @@ class TestResearchNode:
             content=VALID_RESEARCH, model="sonar-pro", tokens_in=500, tokens_out=3000
         )
 
-        with patch("src.pipeline.stages.research.PerplexityClient") as MockClient:
+        with patch("src.pipeline.stages.research.get_perplexity_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(side_effect=[meta_resp, valid_resp])
             instance.close = AsyncMock()
@@ -218,7 +217,7 @@ class TestResearchNode:
             content=META_RESPONSE, model="sonar-pro", tokens_in=200, tokens_out=500
         )
 
-        with patch("src.pipeline.stages.research.PerplexityClient") as MockClient:
+        with patch("src.pipeline.stages.research.get_perplexity_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=meta_resp)
             instance.close = AsyncMock()
@@ -102,6 +102,20 @@ class TestSaveStageOutput:
         post = await _reload_post(db_session, pid)
         assert post.current_stage == "images"
 
+    @pytest.mark.asyncio
+    async def test_commit_false_leaves_write_in_callers_transaction(
+        self, db_session, post_in_db
+    ):
+        pid = post_in_db.id
+        await save_stage_output(
+            db_session, str(pid), "research", "Uncommitted", commit=False
+        )
+        await db_session.rollback()
+
+        post = await _reload_post(db_session, pid)
+        assert post.research_content is None
+        assert post.current_stage == "pending"
+
     @pytest.mark.asyncio
     async def test_unknown_stage_does_not_crash(self, db_session, post_in_db):
         pid = post_in_db.id
@@ -0,0 +1,101 @@
+"""Tests for the shared ClaudeClient reused across stage nodes."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from src.pipeline import helpers
+from src.pipeline.helpers import (
+    claude_chat,
+    close_llm_clients,
+    get_claude_client,
+    get_perplexity_client,
+)
+from src.services.llm import LLMResponse
+
+
+@pytest.fixture(autouse=True)
+def _reset_clients():
+    helpers._claude_clients.clear()
+    helpers._claude_batchers.clear()
+    helpers._perplexity_clients.clear()
+    yield
+    helpers._claude_clients.clear()
+    helpers._claude_batchers.clear()
+    helpers._perplexity_clients.clear()
+
+
+def test_same_key_returns_same_client():
+    first = get_claude_client("sk-ant-test-key")
+    second = get_claude_client("sk-ant-test-key")
+    assert first is second
+
+
+def test_different_keys_get_separate_clients():
+    first = get_claude_client("sk-ant-key-a")
+    second = get_claude_client("sk-ant-key-b")
+    assert first is not second
+
+
+def test_missing_key_raises_and_is_not_cached():
+    with pytest.raises(ValueError, match="not configured"):
+        get_claude_client(None)
+    assert helpers._claude_clients == {}
+
+
+def test_perplexity_client_is_shared():
+    assert get_perplexity_client("pplx-key") is get_perplexity_client("pplx-key")
+
+
+@pytest.mark.asyncio
+async def test_close_clears_cache():
+    get_claude_client("sk-ant-test-key")
+    get_perplexity_client("pplx-key")
+    await close_llm_clients()
+    assert helpers._claude_clients == {}
+    assert helpers._perplexity_clients == {}
+
+
+@pytest.fixture
+def response():
+    return LLMResponse(content="ok", model="claude-opus-4-6", tokens_in=1, tokens_out=1)
+
+
+@pytest.mark.asyncio
+async def test_claude_chat_is_realtime_when_batching_disabled(monkeypatch, response):
+    monkeypatch.setattr(helpers.settings, "claude_batch_enabled", False)
+    client = get_claude_client("sk-ant-test-key")
+    with patch.object(client, "chat", AsyncMock(return_value=response)) as chat:
+        result = await claude_chat("outline", client, {}, "prompt", "system", 100)
+    assert result is response
+    chat.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_claude_chat_is_realtime_for_review_stages(monkeypatch, response):
+    monkeypatch.setattr(helpers.settings, "claude_batch_enabled", True)
+    client = get_claude_client("sk-ant-test-key")
+    state = {"stage_settings": {"outline": "review"}}
+    with patch.object(client, "chat", AsyncMock(return_value=response)) as chat:
+        await claude_chat("outline", client, state, "prompt", "system", 100)
+    chat.assert_awaited_once()
+    assert helpers._claude_batchers == {}
+
+
+@pytest.mark.asyncio
+async def test_claude_chat_batches_auto_stages(monkeypatch, response):
+    monkeypatch.setattr(helpers.settings, "claude_batch_enabled", True)
+    client = get_claude_client("sk-ant-test-key")
+    state = {"stage_settings": {"outline": "auto"}}
+    with (
+        patch.object(client, "chat", AsyncMock()) as chat,
+        patch(
+            "src.pipeline.helpers.ClaudeBatcher.submit",
+            AsyncMock(return_value=response),
+        ) as submit,
+    ):
+        result = await claude_chat("outline", client, state, "prompt", "system", 20000)
+    assert result is response
+    chat.assert_not_awaited()
+    params = submit.call_args.args[0]
+    assert params["system"] == "system"
+    assert params["max_tokens"] == 20000
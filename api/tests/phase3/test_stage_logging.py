@@ -1,11 +1,23 @@
 """Tests for log_stage_execution — verifies stage_logs populated."""
 
+import asyncio
 import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from sqlalchemy import select
 from src.models.post import Post
-from src.pipeline.helpers import MODEL_COSTS, StageTimer, log_stage_execution
+from src.pipeline.helpers import (
+    MODEL_COSTS,
+    StageTimer,
+    clear_event_context,
+    flush_stage_logs,
+    log_stage_execution,
+    publish_stage_log,
+    set_event_context,
+    stage_meta,
+    stage_result,
+)
 
 
 @pytest.fixture
@@ -136,3 +148,122 @@ class TestStageTimer:
 
         assert timer.duration >= 0.04
         assert timer.duration < 1.0
+
+
+class TestStageResult:
+    def test_builds_output_status_and_meta(self):
+        state = {"stage_status": {"research": "complete"}}
+        meta = stage_meta("write", "claude-opus-4-6", 10, 20, 1.5)
+        result = stage_result("write", state, "Draft", meta)
+
+        assert result["draft"] == "Draft"
+        assert result["current_stage"] == "write"
+        assert result["stage_status"] == {"research": "complete", "write": "complete"}
+        assert result["_stage_meta"]["tokens_out"] == 20
+        # The input state's status dict is not mutated
+        assert state["stage_status"] == {"research": "complete"}
+
+    def test_failed_status(self):
+        meta = stage_meta("images", "claude-opus-4-6", 1, 1, 0.1)
+        result = stage_result("images", {}, {"images": []}, meta, "failed")
+        assert result["stage_status"] == {"images": "failed"}
+
+
+class TestPublishStageLog:
+    @pytest.mark.asyncio
+    async def test_noop_without_context(self):
+        clear_event_context()
+        with patch("src.api.events.publish_event", new=AsyncMock()) as mock_pub:
+            await publish_stage_log("hello", stage="outline")
+        mock_pub.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_publishes_with_context(self):
+        redis = AsyncMock()
+        set_event_context(redis, "post-1")
+        try:
+            with patch("src.api.events.publish_event", new=AsyncMock()) as mock_pub:
+                await publish_stage_log("hello", stage="outline")
+        finally:
+            clear_event_context()
+        mock_pub.assert_awaited_once()
+        args = mock_pub.call_args.args
+        assert args[0] is redis
+        assert args[1] == "post-1"
+        assert args[3]["message"] == "hello"
+
+    @pytest.mark.asyncio
+    async def test_db_entries_flushed_in_one_write(self):
+        session = AsyncMock()
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        set_event_context(AsyncMock(), "post-1", session_factory)
+        try:
+            with (
+                patch("src.api.events.publish_event", new=AsyncMock()) as mock_pub,
+                patch(
+                    "src.pipeline.helpers.append_execution_logs", new=AsyncMock()
+                ) as mock_append,
+            ):
+                await publish_stage_log("one", stage="outline")
+                await publish_stage_log("two", stage="outline", data={"n": 2})
+                assert mock_pub.await_count == 2
+                mock_append.assert_not_awaited()
+
+                await flush_stage_logs()
+                await flush_stage_logs()
+        finally:
+            clear_event_context()
+
+        mock_append.assert_awaited_once()
+        post_id, entries = mock_append.call_args.args[1:]
+        assert post_id == "post-1"
+        assert [e["message"] for e in entries] == ["one", "two"]
+        assert entries[1]["data"] == {"n": 2}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_jobs_keep_their_own_buffers(self):
+        """Two interleaved jobs each flush their own post's entries."""
+        session = AsyncMock()
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        a_logged, b_flushed = asyncio.Event(), asyncio.Event()
+
+        async def job_a():
+            token = set_event_context(AsyncMock(), "post-a", session_factory)
+            try:
+                await publish_stage_log("a1", stage="write")
+                a_logged.set()
+                await b_flushed.wait()
+                await publish_stage_log("a2", stage="write")
+                await flush_stage_logs()
+            finally:
+                clear_event_context(token)
+
+        async def job_b():
+            await a_logged.wait()
+            token = set_event_context(AsyncMock(), "post-b", session_factory)
+            try:
+                await publish_stage_log("b1", stage="edit")
+                await flush_stage_logs()
+            finally:
+                clear_event_context(token)
+            b_flushed.set()
+
+        with (
+            patch("src.api.events.publish_event", new=AsyncMock()),
+            patch(
+                "src.pipeline.helpers.append_execution_logs", new=AsyncMock()
+            ) as mock_append,
+        ):
+            await asyncio.gather(
+                asyncio.create_task(job_a()), asyncio.create_task(job_b())
+            )
+
+        written = {
+            call.args[1]: [e["message"] for e in call.args[2]]
+            for call in mock_append.call_args_list
+        }
+        assert written == {"post-a": ["a1", "a2"], "post-b": ["b1"]}
@@ -37,7 +37,7 @@ def mock_claude_response():
 class TestWriteNode:
     @pytest.mark.asyncio
     async def test_returns_draft_content(self, sample_state, mock_claude_response):
-        with patch("src.pipeline.stages.write.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.write.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response)
             instance.close = AsyncMock()
@@ -51,7 +51,7 @@ class TestWriteNode:
 
     @pytest.mark.asyncio
     async def test_prompt_includes_outline(self, sample_state, mock_claude_response):
-        with patch("src.pipeline.stages.write.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.write.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response)
             instance.close = AsyncMock()
@@ -67,7 +67,7 @@ class TestWriteNode:
 
     @pytest.mark.asyncio
     async def test_uses_high_max_tokens(self, sample_state, mock_claude_response):
-        with patch("src.pipeline.stages.write.ClaudeClient") as MockClient:
+        with patch("src.pipeline.stages.write.get_claude_client") as MockClient:
             instance = MockClient.return_value
             instance.chat = AsyncMock(return_value=mock_claude_response)
             instance.close = AsyncMock()
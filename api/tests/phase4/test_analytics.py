@@ -1,7 +1,11 @@
 """Tests for analytics computation service."""
 
 import pytest
-from src.services.analytics import compute_analytics
+from src.services.analytics import (
+    _keyword_density,
+    _strip_markdown,
+    compute_analytics,
+)
 
 
 def test_word_count():
@@ -101,6 +105,21 @@ def test_keyword_density_zero():
     assert result.keyword_density["missing"] == 0
 
 
+def test_keyword_density_matches_whole_words():
+    """'cat' inside 'category' must not count as an occurrence."""
+    plain = "The cat sat. Each category has a cat and a Cat toy."
+    density = _keyword_density(plain, 11, ["cat", "cat toy", "dog"])
+    assert density["cat"] == round(3 / 11 * 100, 2)
+    assert density["cat toy"] == round(2 / 11 * 100, 2)
+    assert density["dog"] == 0
+
+
+def test_keyword_density_hyphenated_keyword():
+    plain = "An AR-15 build. Another ar-15 guide."
+    density = _keyword_density(plain, 6, ["AR-15"])
+    assert density["AR-15"] == round(2 / 6 * 100, 2)
+
+
 def test_seo_keyword_in_title():
     text = "Some content about AR-15 builds."
     result = compute_analytics(
@@ -193,6 +212,22 @@ def hello():
     assert result.seo_checklist["has_h2_headings"] is True
 
 
+def test_strip_markdown_single_pass():
+    """Code and link syntax take precedence over markers nested inside them."""
+    md = (
+        "---\ntitle: Test\n---\n"
+        "# Title\n\n"
+        "**Bold** and [a **linked** word](https://example.com/a_b) "
+        "with ![alt text](img.png).\n\n\n\n"
+        "> Quoted <em>html</em>\n"
+        "```python\n# not a heading\nx = a_b\n```\n"
+        "Some `inline_code` here."
+    )
+    assert _strip_markdown(md) == (
+        "Title\n\nBold and a linked word with alt text.\n\nQuoted html\n\nSome  here."
+    )
+
+
 pytestmark_api = pytest.mark.anyio
 
 
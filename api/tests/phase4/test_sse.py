@@ -1,6 +1,7 @@
 """Tests for SSE event streaming."""
 
 import json
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from src.api.events import publish_event
@@ -52,3 +53,20 @@ async def test_publish_event_data_serialization():
     payload = json.loads(published["pipeline:global"])
     assert payload["tokens"] == 1500
     assert payload["event"] == "stage_started"
+
+
+async def test_publish_event_queues_on_pipeline():
+    """With a pipeline, both publishes are queued rather than sent."""
+    redis = AsyncMock()
+    pipe = MagicMock()
+    await publish_event(
+        redis,
+        post_id="p-1",
+        event="stage_complete",
+        data={"stage": "edit"},
+        pipe=pipe,
+    )
+
+    channels = [call.args[0] for call in pipe.publish.call_args_list]
+    assert channels == ["pipeline:post:p-1", "pipeline:global"]
+    redis.publish.assert_not_awaited()
@@ -5,7 +5,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from src.pipeline.stages.ready import ready_node
+from src.pipeline.stages.ready import _build_ready_prompt, ready_node
 
 
 @pytest.fixture
@@ -54,7 +54,7 @@ async def test_ready_node_returns_expected_keys(ready_state):
     mock_response.tokens_out = 3000
     mock_response.model = "claude-opus-4-6"
 
-    with patch("src.pipeline.stages.ready.ClaudeClient") as MockClaude:
+    with patch("src.pipeline.stages.ready.get_claude_client") as MockClaude:
         instance = MockClaude.return_value
         instance.chat = AsyncMock(return_value=mock_response)
         instance.close = AsyncMock()
@@ -90,7 +90,7 @@ async def test_ready_node_skips_failed_images(ready_state):
     mock_response.tokens_out = 2000
     mock_response.model = "claude-opus-4-6"
 
-    with patch("src.pipeline.stages.ready.ClaudeClient") as MockClaude:
+    with patch("src.pipeline.stages.ready.get_claude_client") as MockClaude:
         instance = MockClaude.return_value
         instance.chat = AsyncMock(return_value=mock_response)
         instance.close = AsyncMock()
@@ -102,3 +102,10 @@ async def test_ready_node_skips_failed_images(ready_state):
     prompt = call_args.kwargs.get("prompt") or call_args[1].get("prompt") or call_args[0][0] if call_args[0] else ""
     # The prompt should be a string that was sent to Claude
     assert result["ready"] == "assembled content"
+
+
+def test_ready_prompt_keeps_non_ascii_manifest_text(ready_state):
+    ready_state["image_manifest"]["images"][0]["alt_text"] = "Crème brûlée – café"
+    prompt = _build_ready_prompt("", ready_state)
+    assert "Crème brûlée – café" in prompt
+    assert "\\u" not in prompt
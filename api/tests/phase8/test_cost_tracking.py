@@ -1,7 +1,7 @@
 """Tests for cost tracking: token → cost computation and stage log accuracy."""
 
 import pytest
-from src.pipeline.helpers import MODEL_COSTS
+from src.pipeline.helpers import MODEL_COSTS, compute_cost
 
 pytestmark = pytest.mark.anyio
 
@@ -63,3 +63,11 @@ def test_cost_api_endpoint(client, sample_post_data):
     """Cost data should be visible through the stage_logs field on post read."""
     # This is a sync helper — the actual async test is in test_error_handling
     pass
+
+
+def test_compute_cost_uses_model_rates():
+    # 2000/1M * 15.0 + 8000/1M * 75.0 = 0.63
+    assert compute_cost("claude-opus-4-6", 2000, 8000) == 0.63
+    # 10000/1M * 3.0 + 50000/1M * 15.0 = 0.78
+    assert compute_cost("sonar-pro", 10000, 50000) == 0.78
+    assert compute_cost("unknown-model", 10000, 50000) == 0.0
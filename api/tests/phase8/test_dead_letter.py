@@ -2,11 +2,12 @@
 
 import json
 import uuid
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from httpx import AsyncClient
 from src.main import app
+from src.worker import DLQ_KEY, DLQ_MAX_ENTRIES, _move_to_dlq
 
 pytestmark = pytest.mark.anyio
 
@@ -137,3 +138,31 @@ async def test_clear_dead_letter(client: AsyncClient, mock_redis):
     # Verify cleared
     resp2 = await client.get("/api/queue/dead-letter")
     assert resp2.json()["count"] == 0
+
+
+async def test_move_to_dlq_pushes_and_caps_list():
+    """A DLQ push trims the list to its newest entries in the same round trip."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis = MagicMock()
+    redis.pipeline.return_value.__aenter__.return_value = pipe
+    session = AsyncMock()
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = session
+
+    post_id = str(uuid.uuid4())
+    await _move_to_dlq(
+        {"session_factory": session_factory, "redis": redis},
+        post_id,
+        "write",
+        "Rate limit exceeded",
+        3,
+    )
+
+    entry = json.loads(pipe.lpush.call_args.args[1])
+    assert pipe.lpush.call_args.args[0] == DLQ_KEY
+    assert entry["post_id"] == post_id
+    assert entry["attempts"] == 3
+    pipe.ltrim.assert_called_once_with(DLQ_KEY, 0, DLQ_MAX_ENTRIES - 1)
+    pipe.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
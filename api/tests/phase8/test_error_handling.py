@@ -3,11 +3,13 @@
 import uuid
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
+from google.genai import errors as genai_errors
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.post import Post
 from src.pipeline.helpers import log_stage_execution
-from src.services.llm import _retry
+from src.services.llm import _is_retryable, _retry
 
 pytestmark = pytest.mark.anyio
 
@@ -37,19 +39,53 @@ async def test_retry_exhausted_raises():
 
 
 async def test_retry_exponential_delay():
-    """Retry delays should increase exponentially."""
+    """Retry delays are jittered under an exponentially growing ceiling."""
     delays = []
 
     async def sleep_tracker(d):
         delays.append(d)
 
-    fn = AsyncMock(side_effect=[ValueError("1"), ValueError("2"), "ok"])
-    with patch("src.services.llm.asyncio.sleep", side_effect=sleep_tracker):
+    fn = AsyncMock(side_effect=[TimeoutError("1"), TimeoutError("2"), "ok"])
+    with (
+        patch("src.services.llm.asyncio.sleep", side_effect=sleep_tracker),
+        patch("src.services.llm.random.uniform", side_effect=lambda lo, hi: hi),
+    ):
         await _retry(fn, retries=3, base_delay=1.0)
 
-    assert len(delays) == 2
-    assert delays[0] == 1.0  # 1.0 * 2^0
-    assert delays[1] == 2.0  # 1.0 * 2^1
+    assert delays == [1.0, 2.0]  # ceilings: 1.0 * 2^0, 1.0 * 2^1
+
+
+def test_gemini_rate_limit_is_retryable():
+    """Gemini 429/5xx are transient; 4xx policy blocks are not."""
+    assert _is_retryable(genai_errors.ClientError(429, {"error": {}}))
+    assert _is_retryable(genai_errors.ServerError(503, {"error": {}}))
+    assert not _is_retryable(genai_errors.ClientError(400, {"error": {}}))
+
+
+def test_network_errors_are_retryable():
+    """Timeouts and connection failures retry; programming errors don't."""
+    assert _is_retryable(httpx.ReadTimeout("slow"))
+    assert _is_retryable(httpx.ConnectError("refused"))
+    assert _is_retryable(TimeoutError())
+    assert _is_retryable(ConnectionResetError())
+    assert not _is_retryable(ValueError("bad"))
+
+
+async def test_retry_full_jitter_delay_is_capped():
+    """With max_delay, delays are jittered within [0, min(cap, base * 2^n)]."""
+    delays = []
+
+    async def sleep_tracker(d):
+        delays.append(d)
+
+    fn = AsyncMock(side_effect=[TimeoutError()] * 4 + ["ok"])
+    with patch("src.services.llm.asyncio.sleep", side_effect=sleep_tracker):
+        result = await _retry(fn, retries=5, base_delay=1.0, max_delay=3.0)
+
+    assert result == "ok"
+    assert len(delays) == 4
+    for attempt, delay in enumerate(delays):
+        assert 0 <= delay <= min(3.0, 1.0 * 2**attempt)
 
 
 async def test_log_stage_execution_cost_calculation(db_session: AsyncSession):
@@ -65,7 +65,9 @@ async def test_recrawl_enqueues_never_crawled(db_session: AsyncSession, db_engin
     ctx = _make_ctx(sf, redis)
     await check_recrawl_schedules(ctx)
 
-    redis.enqueue_job.assert_called_once_with("crawl_profile_sitemap", str(profile.id))
+    redis.enqueue_job.assert_called_once_with(
+        "crawl_profile_sitemap", str(profile.id), _job_id=f"recrawl:{profile.id}"
+    )
 
 
 async def test_recrawl_weekly_due(db_session: AsyncSession, db_engine):
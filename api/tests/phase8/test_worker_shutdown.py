@@ -1,7 +1,10 @@
 """Tests for worker graceful shutdown and configuration."""
 
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
-from src.worker import MAX_ATTEMPTS, WorkerSettings
+from src.pipeline.state import STAGES
+from src.worker import MAX_ATTEMPTS, WorkerSettings, _warm_pool, _warm_up
 
 pytestmark = pytest.mark.anyio
 
@@ -50,3 +53,45 @@ def test_worker_settings_concurrency():
     from src.config import settings
 
     assert WorkerSettings.max_jobs == settings.worker_max_jobs
+
+
+def test_worker_settings_poll_delay():
+    """Queue poll interval should come from settings (ARQ default 0.5s)."""
+    from src.config import settings
+
+    assert WorkerSettings.poll_delay == settings.worker_poll_delay_s == 0.5
+
+
+def test_warm_up_loads_rules_and_tolerates_scorer_errors():
+    """Warm-up caches every rule file and never fails worker startup."""
+    with (
+        patch("src.worker.load_rules") as load_rules,
+        patch("src.worker.compute_analytics", side_effect=LookupError("cmudict")),
+    ):
+        _warm_up()
+
+    assert [c.args[0] for c in load_rules.call_args_list] == STAGES
+
+
+async def test_warm_pool_opens_and_returns_connections():
+    """Pool warm-up connects up front and gives every connection back."""
+    conns = [AsyncMock() for _ in range(3)]
+    engine = MagicMock()
+    engine.connect = AsyncMock(side_effect=conns)
+
+    await _warm_pool(engine, 3)
+
+    assert engine.connect.await_count == 3
+    for conn in conns:
+        conn.close.assert_awaited_once()
+
+
+async def test_warm_pool_tolerates_unreachable_database():
+    """A failed connect is logged; connections already opened are returned."""
+    conn = AsyncMock()
+    engine = MagicMock()
+    engine.connect = AsyncMock(side_effect=[conn, OSError("refused")])
+
+    await _warm_pool(engine, 3)
+
+    conn.close.assert_awaited_once()
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
+from src.services import link_validator
 from src.services.link_validator import (
     strip_dead_links_html,
     validate_links,
@@ -20,6 +21,16 @@ def _mock_response(status_code: int):
     return resp
 
 
+@pytest.fixture(autouse=True)
+def _reset_shared_state():
+    """Drop the pooled client and status cache between tests."""
+    link_validator._client = None
+    link_validator._STATUS_CACHE.clear()
+    yield
+    link_validator._client = None
+    link_validator._STATUS_CACHE.clear()
+
+
 @pytest.fixture
 def mock_client():
     """Patch httpx.AsyncClient to control HTTP responses."""
@@ -135,6 +146,37 @@ async def test_multiple_dead_links(mock_client):
     assert len(result.removed) == 2
 
 
+async def test_head_rejected_falls_back_to_ranged_get(mock_client):
+    mock_client.head = AsyncMock(return_value=_mock_response(405))
+    mock_client.get = AsyncMock(return_value=_mock_response(404))
+
+    with patch(PATCH_TARGET, return_value=mock_client):
+        result = await validate_links("See [Page](https://cdn.com/page) here.")
+
+    assert result.content == "See Page here."
+    assert mock_client.get.call_args.kwargs["headers"] == {"Range": "bytes=0-0"}
+
+
+async def test_status_is_cached_between_calls(mock_client):
+    mock_client.head = AsyncMock(return_value=_mock_response(200))
+
+    with patch(PATCH_TARGET, return_value=mock_client):
+        await validate_links("See [Page](https://example.com) here.")
+        await validate_links("Again [Page](https://example.com) here.")
+
+    mock_client.head.assert_awaited_once()
+
+
+async def test_errors_are_not_cached(mock_client):
+    mock_client.head = AsyncMock(side_effect=httpx.ConnectError("refused"))
+
+    with patch(PATCH_TARGET, return_value=mock_client):
+        await validate_links("Try [Down](https://down.com) later.")
+        await validate_links("Try [Down](https://down.com) later.")
+
+    assert mock_client.head.await_count == 2
+
+
 def test_strip_dead_links_html():
     html = '<p>Click <a href="https://dead.com">here</a> for info.</p>'
     result = strip_dead_links_html(html, {"https://dead.com"})